@@ -23,48 +23,231 @@
 # Generative AI has been used extensively while developing this package.
 # 
 
+import gzip
 import os
 import time
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config.config_loader import load_config
 
+# Shared HTTP session with a keep-alive connection pool. Reusing connections
+# across model requests avoids paying a fresh TCP/TLS handshake on every call.
+# Transient failures (429/5xx) retry with exponential backoff on the same
+# pooled connection instead of surfacing immediately to the caller.
+_SESSION = requests.Session()
+_RETRIES = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(['POST']),
+)
+_ADAPTER = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=_RETRIES)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.headers.update({
+    "Connection": "keep-alive",
+    "Accept-Encoding": "gzip, deflate",
+})
+
+# Optional async client (httpx) for issuing several model requests
+# concurrently. HTTP/2 multiplexing lets parallel calls share one connection.
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+_ACLIENT = None
+
+def _get_async_client():
+    """Return the shared httpx.AsyncClient, creating it on first use."""
+    global _ACLIENT
+    if httpx is None:
+        raise RuntimeError("httpx is required for async model requests. Install it with: pip install httpx")
+    if _ACLIENT is None:
+        limits = httpx.Limits(max_keepalive_connections=40, max_connections=100, keepalive_expiry=30.0)
+        try:
+            _ACLIENT = httpx.AsyncClient(http2=True, timeout=30.0, limits=limits)
+        except ImportError:
+            # HTTP/2 support (h2) not installed; fall back to HTTP/1.1 keep-alive
+            _ACLIENT = httpx.AsyncClient(timeout=30.0, limits=limits)
+    return _ACLIENT
+
+async def close_async_client():
+    """Close the shared async client (call before the event loop shuts down)."""
+    global _ACLIENT
+    if _ACLIENT is not None:
+        await _ACLIENT.aclose()
+        _ACLIENT = None
+
+# Serializer for the request hot path, by preference: msgspec's C encoder,
+# then orjson, then stdlib json. The first two are several times faster than
+# the stdlib and produce bytes directly.
+try:
+    import msgspec.json as _msgspec_json
+    _json_dumps = _msgspec_json.Encoder().encode
+    _json_loads = _msgspec_json.Decoder().decode
+except ImportError:
+    try:
+        import orjson
+        def _json_dumps(obj):
+            return orjson.dumps(obj)
+        _json_loads = orjson.loads
+    except ImportError:
+        def _json_dumps(obj):
+            return json.dumps(obj).encode()
+        _json_loads = json.loads
+
+# Request-body compression is opt-in (COMPRESS_REQUEST_BODY=1): stock
+# Ollama and Open WebUI do not decompress gzipped request bodies, so it
+# only helps behind a proxy or gateway that does. Responses still
+# negotiate compression via the session's Accept-Encoding header. Bodies
+# above the threshold compress well (large few-shot prompts are highly
+# repetitive), which matters for off-box endpoints.
+_GZIP_THRESHOLD = 1024
+_GZIP_REQUESTS = os.getenv('COMPRESS_REQUEST_BODY', '').lower() in ('1', 'true', 'yes')
+
+def _encode_body(request_payload, headers):
+    """Serialize the payload, gzipping large bodies when opted in."""
+    if not request_payload:
+        return None, headers
+    body = _json_dumps(request_payload)
+    if _GZIP_REQUESTS and len(body) > _GZIP_THRESHOLD:
+        body = gzip.compress(body)
+        # The cached headers dict is shared; copy before adding the encoding
+        headers = dict(headers)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+# Endpoint settings resolved from the environment once per config state and
+# refreshed only when load_config reports a different parsed config, so the
+# request hot path skips repeated os.getenv lookups and header rebuilds.
+_ENDPOINT_CACHE = {"cfg": None, "url": None, "headers": None}
+
+def _get_endpoint():
+    """Return (url, headers), re-reading the environment only when the config changed."""
+    cfg = load_config()
+    if _ENDPOINT_CACHE["cfg"] is not cfg:
+        url = os.getenv('URL_GENERATE', None)
+        api_key = os.getenv('API_KEY', None)
+        headers = dict()
+        headers["Content-Type"] = "application/json"
+        if api_key: headers["Authorization"] = f"Bearer {api_key}"
+        _ENDPOINT_CACHE.update(cfg=cfg, url=url, headers=headers)
+    return _ENDPOINT_CACHE["url"], _ENDPOINT_CACHE["headers"]
+
+
+def _build_ollama_payload(model, prompt, options):
+    result_payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": False,
+    }
+    if options:
+        # "format" is a top-level Ollama field ("json" constrains decoding
+        # to valid JSON), not a sampling option
+        fmt = options.pop("format", None)
+        if fmt:
+            result_payload["format"] = fmt
+        if options:
+            result_payload["options"] = options
+    return result_payload
+
+
+def _build_open_webui_payload(model, prompt, parameters):
+    # @TODO need to verify the format for 'parameters' for 'open-webui' is correct.
+    # [Issue 2](https://github.com/genilab-fau/prompt-eng/issues/2)
+    result_payload = {
+        "model": model,
+        "messages": [ {"role" : "user", "content": prompt } ]
+    }
+    if parameters:
+        # OpenAI-compatible constrained decoding lives at the top level
+        response_format = parameters.pop("response_format", None)
+        if response_format:
+            result_payload["response_format"] = response_format
+        if parameters:
+            result_payload["parameters"] = parameters
+    return result_payload
+
+
+# Dispatch table replaces per-call target string comparisons
+_PAYLOAD_BUILDERS = {
+    "ollama": _build_ollama_payload,
+    "open-webui": _build_open_webui_payload,
+}
+
+
 def create_payload(model, prompt, target="ollama", **kwargs):
     """
     Create the Request Payload in the format required byt the Model Server
-    @NOTE: 
+    @NOTE:
     Need to adjust here to support multiple target formats
     target can be only ('ollama' or 'open-webui')
 
     @TODO it should be able to self_discover the target Model Server
     [Issue 1](https://github.com/genilab-fau/prompt-eng/issues/1)
     """
+    builder = _PAYLOAD_BUILDERS.get(target)
+    if builder is None:
+        print(f'!!ERROR!! Unknown target: {target}')
+        return None
+    # kwargs is a fresh dict owned by this call, so it can be attached to the
+    # payload directly without rebuilding it key by key.
+    return builder(model, prompt, kwargs)
 
-    result_payload = None
-    if target == "ollama":
-        result_payload = {
-            "model": model,
-            "prompt": prompt, 
-            "stream": False,
-        }
-        if kwargs:
-            result_payload["options"] = {key: value for key, value in kwargs.items()}
 
+def create_payload_batch(model, prompts, target="ollama", **kwargs):
+    """
+    Create the Request Payloads for a batch of prompts.
+
+    For 'ollama' this returns one payload per prompt; dispatch them together
+    with model_req_batch so the server can batch them in a single wave.
+    For 'open-webui' it returns a single payload carrying all prompts as
+    user turns.
+    """
+    if target == "ollama":
+        return [create_payload(model, prompt, target=target, **kwargs) for prompt in prompts]
     elif target == "open-webui":
-        # @TODO need to verify the format for 'parameters' for 'open-webui' is correct.
-        # [Issue 2](https://github.com/genilab-fau/prompt-eng/issues/2)
         result_payload = {
             "model": model,
-            "messages": [ {"role" : "user", "content": prompt } ]
+            "messages": [{"role": "user", "content": prompt} for prompt in prompts]
         }
-        
-        # Handle parameters for open-webui
         if kwargs:
             result_payload["parameters"] = {key: value for key, value in kwargs.items()}
-        
+        return [result_payload]
     else:
         print(f'!!ERROR!! Unknown target: {target}')
-    return result_payload
+        return None
+
+
+def model_req_batch(request_payloads):
+    """
+    Issue several requests to the Model Server in one go.
+
+    Payloads are dispatched concurrently over the shared async client so the
+    server-side batcher can group them; falls back to sequential sync requests
+    when httpx is not installed. Returns a list of (time, response) tuples
+    aligned with the input payloads.
+    """
+    if httpx is None:
+        return [model_req(request_payload=payload) for payload in request_payloads]
+
+    import asyncio
+
+    async def _gather():
+        try:
+            return await asyncio.gather(
+                *(model_req_async(request_payload=payload) for payload in request_payloads)
+            )
+        finally:
+            # The event loop is torn down after asyncio.run, so the pooled
+            # connections cannot be reused across batches; close them cleanly.
+            await close_async_client()
+
+    return asyncio.run(_gather())
 
 
 def model_req(request_payload=None):
@@ -73,24 +256,26 @@ def model_req(request_payload=None):
     """
         
     try:
-        load_config()
+        url, headers = _get_endpoint()
     except FileNotFoundError:
         return -1, "!!ERROR!! Problem loading configuration - File not Found"
 
-    url = os.getenv('URL_GENERATE', None)
-    api_key = os.getenv('API_KEY', None)
     delta = resp = None
 
-    headers = dict()
-    headers["Content-Type"] = "application/json"
-    if api_key: headers["Authorization"] = f"Bearer {api_key}"
-
     print(request_payload)
 
     # Send out request to Model Provider
+    body, headers = _encode_body(request_payload, headers)
     try:
         start_time = time.time()
-        resp = requests.post(url, data=json.dumps(request_payload) if request_payload else None, headers=headers, timeout=30)
+        resp = _SESSION.post(url, data=body, headers=headers, timeout=30, stream=True)
+        body = None
+        if resp.status_code == 200:
+            # Stream the body into a buffer in fixed-size chunks instead of
+            # letting requests materialize the whole response before parsing.
+            body = bytearray()
+            for chunk in resp.iter_content(65536):
+                body += chunk
         delta = time.time() - start_time
     except requests.RequestException:
         return -1, f"!!ERROR!! Request failed! You need to adjust config with URL({url})"
@@ -104,7 +289,7 @@ def model_req(request_payload=None):
         result = ""
         delta = round(delta, 3)
 
-        response_json = resp.json()
+        response_json = _json_loads(bytes(body))
         if 'response' in response_json: ## ollama
             result = response_json['response']
         elif 'choices' in response_json: ## open-webui
@@ -119,6 +304,88 @@ def model_req(request_payload=None):
         return -1, f"!!ERROR!! HTTP Response={resp.status_code}, {resp.text}"
 
 
+def model_req_stream(request_payload=None):
+    """
+    Issue a streaming request to the Model Server and yield response
+    fragments as they arrive instead of buffering the whole completion.
+    The payload's "stream" flag is switched on automatically.
+    """
+
+    try:
+        url, headers = _get_endpoint()
+    except FileNotFoundError:
+        yield "!!ERROR!! Problem loading configuration - File not Found"
+        return
+
+    if request_payload:
+        request_payload = dict(request_payload)
+        request_payload["stream"] = True
+
+    body, headers = _encode_body(request_payload, headers)
+    try:
+        with _SESSION.post(url, data=body, headers=headers, timeout=30, stream=True) as resp:
+            if resp.status_code != 200:
+                yield f"!!ERROR!! HTTP Response={resp.status_code}, {resp.text}"
+                return
+
+            # Each line is one NDJSON fragment carrying a piece of the response
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                fragment = _json_loads(line)
+                if 'response' in fragment: ## ollama
+                    yield fragment['response']
+                elif 'choices' in fragment: ## open-webui
+                    yield fragment['choices'][0]['message']['content']
+                if fragment.get('done'):
+                    break
+    except requests.RequestException:
+        yield f"!!ERROR!! Request failed! You need to adjust config with URL({url})"
+
+
+async def model_req_async(request_payload=None):
+    """
+    Async variant of model_req backed by a shared httpx.AsyncClient.
+    Use asyncio.gather over several calls to issue model requests concurrently
+    instead of serially.
+    """
+
+    try:
+        url, headers = _get_endpoint()
+    except FileNotFoundError:
+        return -1, "!!ERROR!! Problem loading configuration - File not Found"
+
+    client = _get_async_client()
+
+    # Send out request to Model Provider
+    body, headers = _encode_body(request_payload, headers)
+    try:
+        start_time = time.time()
+        resp = await client.post(url, content=body, headers=headers)
+        delta = time.time() - start_time
+    except httpx.HTTPError:
+        return -1, f"!!ERROR!! Request failed! You need to adjust config with URL({url})"
+
+    # Checking the response and extracting the 'response' field
+    if resp.status_code == 200:
+        result = ""
+        delta = round(delta, 3)
+
+        response_json = _json_loads(resp.content)
+        if 'response' in response_json: ## ollama
+            result = response_json['response']
+        elif 'choices' in response_json: ## open-webui
+            result = response_json['choices'][0]['message']['content']
+        else:
+            result = response_json
+
+        return delta, result
+    elif resp.status_code == 401:
+        return -1, f"!!ERROR!! Authentication issue. You need to adjust prompt-eng/config with API_KEY ({url})"
+    else:
+        return -1, f"!!ERROR!! HTTP Response={resp.status_code}, {resp.text}"
+
+
 ###
 ### DEBUG
 ###
@@ -1,65 +1,87 @@
 import os
 import json
-from pathlib import Path
+
+# Use orjson for config parsing when available; fall back to stdlib json.
+try:
+    import orjson
+    def _json_loads(data):
+        return orjson.loads(data)
+    def _json_dumps_str(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps_str = json.dumps
+
+# Cache of parsed configurations keyed on (path, mtime_ns, size) so repeated
+# calls skip the disk read + JSON parse unless the file actually changed.
+_CFG_CACHE = {}
+
+# Values last applied to os.environ per config path. Writing os.environ goes
+# through putenv and mutates the process environment, so re-applying an
+# unchanged config (e.g. after a touch) is skipped entirely.
+_APPLIED_ENV = {}
+
+# Configuration search paths (in order of precedence), precomputed once as
+# plain strings so each lookup is a single os.path.isfile call.
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(_SCRIPT_DIR)
+_SEARCH_PATHS = (
+    os.path.join(_SCRIPT_DIR, "settings.json"),                # config/settings.json
+    os.path.join(_PROJECT_ROOT, "config", "settings.json"),    # direct reference to config/settings.json
+    os.path.join(_SCRIPT_DIR, "_config.json"),                 # config/_config.json
+    os.path.join(_SCRIPT_DIR, "_config"),                      # config/_config
+    os.path.join(_PROJECT_ROOT, "_config.json"),               # _config.json
+    os.path.join(_PROJECT_ROOT, "_config")                     # _config
+)
 
 def load_config():
     """
     Load configuration from multiple possible locations with fallback support.
     Supports JSON format for better structure and environment variable overrides.
+
+    Results are cached per file mtime; the file is only re-read and re-parsed
+    when it changes on disk. Use load_config.cache_clear() to reset.
     """
-    # Get the directory of the current script
-    script_dir = Path(__file__).parent.absolute()
-    project_root = script_dir.parent
-    
-    # Configuration search paths (in order of precedence)
-    config_locations = [
-        script_dir / "settings.json",              # config/settings.json
-        project_root / "config" / "settings.json", # direct reference to config/settings.json
-        script_dir / "_config.json",               # config/_config.json
-        script_dir / "_config",                    # config/_config
-        project_root / "_config.json",             # _config.json
-        project_root / "_config"                   # _config
-    ]
-    
     # Environment variable that can override config location
     env_config_path = os.environ.get("CONFIG_PATH")
-    if env_config_path:
-        config_locations.insert(0, Path(env_config_path))
-    
+    search_paths = (env_config_path,) + _SEARCH_PATHS if env_config_path else _SEARCH_PATHS
+
     # Find first available config
     config_data = {}
     config_path = None
-    
-    for location in config_locations:
-        if location.exists():
+
+    for location in search_paths:
+        if os.path.isfile(location):
             config_path = location
             break
-    
+
     if not config_path:
-        # As a last resort, try to find settings.json anywhere in the project
-        settings_files = list(project_root.glob("**/settings.json"))
-        if settings_files:
-            config_path = settings_files[0]
-        else:
-            raise FileNotFoundError(
-                "Configuration file not found. Searched: " + 
-                ", ".join(str(p) for p in config_locations)
-            )
-    
+        raise FileNotFoundError(
+            "Configuration file not found. Searched: " +
+            ", ".join(search_paths)
+        )
+
+    # Return the cached result if the file is unchanged since last parse
+    stat = os.stat(config_path)
+    cache_key = (config_path, stat.st_mtime_ns, stat.st_size)
+    cached = _CFG_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    is_json = config_path.endswith('.json')
+
     # Load configuration based on file type
-    if config_path.suffix == '.json':
+    env_updates = {}
+    if is_json:
         with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-            # Set environment variables from JSON
+            config_data = _json_loads(f.read())
+            # Collect environment variables from JSON
             for key, value in config_data.items():
                 # Skip comment keys
                 if key.startswith('//'):
                     continue
-                    
-                if isinstance(value, str):
-                    os.environ[key] = value
-                else:
-                    os.environ[key] = json.dumps(value)
+
+                env_updates[key] = value if isinstance(value, str) else _json_dumps_str(value)
     else:
         # Legacy format (key=value)
         with open(config_path, 'r', encoding='utf-8') as f:
@@ -68,12 +90,22 @@ def load_config():
                 if line and not line.startswith("#"):
                     try:
                         key, value = line.split('=', 1)
-                        os.environ[key.strip()] = value.strip()
+                        env_updates[key.strip()] = value.strip()
                     except ValueError:
                         print(f"Warning: Ignoring invalid config line: {line}")
-    
-    return {
-        "config_path": str(config_path),
-        "config_format": "json" if config_path.suffix == '.json' else "legacy",
+
+    # Only touch os.environ when the values actually changed
+    if _APPLIED_ENV.get(config_path) != env_updates:
+        os.environ.update(env_updates)
+        _APPLIED_ENV[config_path] = env_updates
+
+
+    result = {
+        "config_path": config_path,
+        "config_format": "json" if is_json else "legacy",
         "loaded_keys": list(config_data.keys()) if config_data else None
-    }
\ No newline at end of file
+    }
+    _CFG_CACHE[cache_key] = result
+    return result
+
+load_config.cache_clear = _CFG_CACHE.clear
\ No newline at end of file
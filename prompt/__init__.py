@@ -4,40 +4,7 @@
 Prompt Engineering Package
 """
 
-# Core functionality
-from .prompt_refiner import iterative_prompt_refinement, format_final_prompt
-from .template_generator import determine_template
-from .utils import format_prompt_with_template
-
-# Templates module exports
-from .templates import (
-    get_role_template,
-    get_technique_template,
-    get_l1_technique_template,
-    get_l2_technique_step_template,
-    get_l2_technique_steps_count,
-    list_all_templates
-)
-
-# Techniques module exports
-from .techniques import (
-    apply_technique,
-    select_technique,
-    get_technique_description,
-    get_l1_technique_names,
-    get_l2_technique_names,
-    apply_l1_technique,
-    execute_l2_technique_step,
-    execute_l2_technique_full
-)
-
-# Parameters module exports
-from .parameters import (
-    get_parameters_for_task,
-    validate_parameters,
-    merge_parameters,
-    get_parameter_presets
-)
+import importlib
 
 __all__ = [
     # Core functions
@@ -45,7 +12,7 @@ __all__ = [
     'format_final_prompt',
     'determine_template',
     'format_prompt_with_template',
-    
+
     # Template functions
     'get_role_template',
     'get_technique_template',
@@ -53,7 +20,7 @@ __all__ = [
     'get_l2_technique_step_template',
     'get_l2_technique_steps_count',
     'list_all_templates',
-    
+
     # Technique functions
     'apply_technique',
     'select_technique',
@@ -63,10 +30,59 @@ __all__ = [
     'apply_l1_technique',
     'execute_l2_technique_step',
     'execute_l2_technique_full',
-    
+
     # Parameter functions
     'get_parameters_for_task',
     'validate_parameters',
     'merge_parameters',
     'get_parameter_presets'
-]
\ No newline at end of file
+]
+
+# Map of exported names to their defining submodules. Submodules are imported
+# lazily on first attribute access (PEP 562), so `import prompt` stays cheap
+# for scripts that only need a single helper and avoids pulling in the model
+# request stack until it is actually used.
+_LAZY_ATTRS = {
+    # Core functionality
+    'iterative_prompt_refinement': 'prompt.prompt_refiner',
+    'format_final_prompt': 'prompt.prompt_refiner',
+    'determine_template': 'prompt.template_generator',
+    'format_prompt_with_template': 'prompt.utils',
+
+    # Templates module exports
+    'get_role_template': 'prompt.templates',
+    'get_technique_template': 'prompt.templates',
+    'get_l1_technique_template': 'prompt.templates',
+    'get_l2_technique_step_template': 'prompt.templates',
+    'get_l2_technique_steps_count': 'prompt.templates',
+    'list_all_templates': 'prompt.templates',
+
+    # Techniques module exports
+    'apply_technique': 'prompt.techniques',
+    'select_technique': 'prompt.techniques',
+    'get_technique_description': 'prompt.techniques',
+    'get_l1_technique_names': 'prompt.techniques',
+    'get_l2_technique_names': 'prompt.techniques',
+    'apply_l1_technique': 'prompt.techniques',
+    'execute_l2_technique_step': 'prompt.techniques',
+    'execute_l2_technique_full': 'prompt.techniques',
+
+    # Parameters module exports
+    'get_parameters_for_task': 'prompt.parameters',
+    'validate_parameters': 'prompt.parameters',
+    'merge_parameters': 'prompt.parameters',
+    'get_parameter_presets': 'prompt.parameters',
+}
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    # Cache on the package so subsequent accesses skip this hook
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
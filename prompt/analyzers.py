@@ -2,9 +2,70 @@
 # Import necessary modules
 import json
 import re
-from config._pipeline import create_payload, model_req  # Use relative import
+
+# Use orjson for response parsing when available (significantly faster than
+# stdlib json); fall back transparently otherwise.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Compiled once; DOTALL lets '.' span newlines so the response no longer
+# needs a flattened copy before searching.
+_JSON_RE = re.compile(r'({.+})', re.DOTALL)
+
+# Optional schema-validated decoder (msgspec): parses and validates the
+# expected analysis shape in a single C call. Every field defaults to None
+# so a partial-but-valid response keeps only the keys the model actually
+# returned — the hardcoded math defaults are reserved for the parse-failure
+# path below. Malformed responses fall through to the tolerant regex + json
+# path.
+try:
+    import msgspec
+
+    class _AnalyzerConfig(msgspec.Struct):
+        quality_score: float | None = None
+        improved_prompt: str | None = None
+        role: str | None = None
+        technique: str | None = None
+        task_type: str | None = None
+        template: str | None = None
+        parameters: dict | None = None
+        reasoning: str | None = None
+
+    _CONFIG_DECODER = msgspec.json.Decoder(_AnalyzerConfig)
+except ImportError:
+    msgspec = None
+    _CONFIG_DECODER = None
+from config._pipeline import create_payload, model_req, model_req_async, model_req_batch  # Use relative import
 from .techniques import BASIC_TECHNIQUES, L1_TECHNIQUES
 
+# Constants shared by every meta-analysis call: the JSON-formatting preamble
+# and the default model parameters never change, so they are built once here
+# instead of on each invocation.
+_JSON_PREAMBLE = (
+    "You will analyze a user query and provide a JSON response. "
+    "Your response must ONLY contain valid JSON with no commentary before or after. "
+    "The JSON must be on a single line with no line breaks within values. "
+    "All strings must use double quotes. "
+    "The JSON must be parseable by json.loads().\n\n"
+)
+
+_DEFAULT_META_PARAMS = {
+    "temperature": 0.2,
+    "num_ctx": 2048,
+    "num_predict": 512
+}
+
+# Constrained-decoding flags per target: asking the backend to emit valid
+# JSON directly removes most parse failures (and the retry iterations they
+# cost). parse_json_response keeps its tolerant path for backends that
+# ignore the flag.
+_JSON_FORMAT_PARAMS = {
+    "ollama": {"format": "json"},
+    "open-webui": {"response_format": {"type": "json_object"}},
+}
+
 def call_llm_for_analysis(meta_prompt, model="llama3.2:latest", target="open-webui", **model_params):
     """
     Call the LLM specifically for meta-analysis of incoming queries.
@@ -19,26 +80,14 @@ def call_llm_for_analysis(meta_prompt, model="llama3.2:latest", target="open-web
         str: JSON response from the model with template configuration
     """
     # Enhance the prompt with JSON formatting instructions
-    enhanced_prompt = (
-        "You will analyze a user query and provide a JSON response. "
-        "Your response must ONLY contain valid JSON with no commentary before or after. "
-        "The JSON must be on a single line with no line breaks within values. "
-        "All strings must use double quotes. "
-        "The JSON must be parseable by json.loads().\n\n" + meta_prompt
-    )
-    
-    # Set default parameters if not provided
-    default_params = {
-        "temperature": 0.2,
-        "num_ctx": 2048,
-        "num_predict": 512
-    }
-    
+    enhanced_prompt = _JSON_PREAMBLE + meta_prompt
+
     # Use provided parameters, falling back to defaults when needed
-    for key, value in default_params.items():
-        if key not in model_params:
-            model_params[key] = value
-    
+    model_params = {**_DEFAULT_META_PARAMS,
+                    **_JSON_FORMAT_PARAMS.get(target, {}),
+                    **model_params}
+
+
     # Create payload using the parameters from the caller
     meta_payload = create_payload(
         target=target,
@@ -52,6 +101,70 @@ def call_llm_for_analysis(meta_prompt, model="llama3.2:latest", target="open-web
     
     return meta_response
 
+async def call_llm_for_analysis_async(meta_prompt, model="llama3.2:latest", target="open-webui", **model_params):
+    """
+    Async variant of call_llm_for_analysis.
+
+    Gather several of these with asyncio.gather to run meta-analysis
+    calls concurrently instead of one at a time.
+    """
+    enhanced_prompt = _JSON_PREAMBLE + meta_prompt
+
+    model_params = {**_DEFAULT_META_PARAMS,
+                    **_JSON_FORMAT_PARAMS.get(target, {}),
+                    **model_params}
+
+    meta_payload = create_payload(
+        target=target,
+        model=model,
+        prompt=enhanced_prompt,
+        **model_params
+    )
+
+    _, meta_response = await model_req_async(request_payload=meta_payload)
+
+    return meta_response
+
+def call_llm_for_analysis_many(meta_prompts, model="llama3.2:latest", target="open-webui", **model_params):
+    """
+    Run meta-analysis for several prompts in one batched dispatch.
+
+    Args:
+        meta_prompts (list): Prompts asking for analysis of user queries
+        model (str): Model to use for analysis
+        target (str): Target platform (open-webui, ollama, etc.)
+        **model_params: Additional parameters to pass to the model
+
+    Returns:
+        list: JSON responses from the model, aligned with meta_prompts
+    """
+    model_params = {**_DEFAULT_META_PARAMS,
+                    **_JSON_FORMAT_PARAMS.get(target, {}),
+                    **model_params}
+
+    payloads = [
+        create_payload(
+            target=target,
+            model=model,
+            prompt=_JSON_PREAMBLE + meta_prompt,
+            **model_params
+        )
+        for meta_prompt in meta_prompts
+    ]
+
+    results = model_req_batch(payloads)
+    return [response for _, response in results]
+
+def _validate_technique(result):
+    """Replace an unrecognized technique suggestion with a known default."""
+    if "technique" in result:
+        technique = result["technique"]
+        # Check if the technique exists in our catalogs
+        if technique not in BASIC_TECHNIQUES and technique not in L1_TECHNIQUES:
+            print(f"Warning: Unknown technique '{technique}'. Using 'chain_of_thought' instead.")
+            result["technique"] = "chain_of_thought"
+    return result
+
 def parse_json_response(response):
     """
     Extract and parse the JSON configuration from the LLM response.
@@ -82,24 +195,36 @@ def parse_json_response(response):
     print(f"Raw response to parse: {response[:100]}...")
     
     try:
-        # Look for a JSON object
-        match = re.search(r'({.+})', response.replace('\n', ' '), re.DOTALL)
-        if match:
-            json_str = match.group(1)
+        # Fast path: the response is already a bare JSON object. Raw
+        # newlines inside string values are invalid JSON but a common LLM
+        # failure mode, so the candidate object is flattened before
+        # decoding — strict decoders reject it otherwise.
+        stripped = response.strip()
+        if stripped.startswith('{') and stripped.endswith('}'):
+            if '\n' in stripped:
+                stripped = stripped.replace('\n', ' ')
+            # Schema-validated decode when msgspec is available: parse and
+            # validate in one pass, filling absent fields with the defaults
+            if _CONFIG_DECODER is not None:
+                try:
+                    decoded = msgspec.structs.asdict(_CONFIG_DECODER.decode(stripped))
+                    # Absent fields stay absent: drop the None placeholders
+                    result = {key: value for key, value in decoded.items()
+                              if value is not None}
+                    return _validate_technique(result)
+                except msgspec.DecodeError:
+                    pass  # fall through to the tolerant path
+            json_str = stripped
+        else:
+            # Look for a JSON object embedded in surrounding text
+            match = _JSON_RE.search(response)
+            json_str = match.group(1).replace('\n', ' ') if match else None
+
+        if json_str:
             # Try to parse the JSON
             try:
-                result = json.loads(json_str)
-                # If technique is provided but not recognized, use a default
-                if "technique" in result:
-                    technique = result["technique"]
-                    valid_techniques = list(BASIC_TECHNIQUES.keys()) + list(L1_TECHNIQUES.keys())
-                    
-                    # Check if the technique exists in our catalogs
-                    if technique not in valid_techniques:
-                        print(f"Warning: Unknown technique '{technique}'. Using 'chain_of_thought' instead.")
-                        result["technique"] = "chain_of_thought"
-                
-                return result
+                result = _json_loads(json_str)
+                return _validate_technique(result)
             except json.JSONDecodeError as e:
                 print(f"JSON parsing error: {e}")
                 return default_config
@@ -4,7 +4,11 @@ Parameters module for prompt engineering.
 Contains parameter configurations for different tasks and parameter validation functions.
 """
 
-from typing import Dict, Any, Optional, Union
+import sys
+from array import array
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Union
 
 # Dictionary mapping task types to parameter configurations
 TASK_PARAMETERS = {
@@ -220,63 +224,120 @@ TASK_PARAMETERS = {
     }
 }
 
-def get_parameters_for_task(task_type: str, base_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+# Freeze the table: interned keys make lookups a pointer comparison in the
+# common case, and the read-only views (outer and inner) prevent accidental
+# mutation of the presets.
+TASK_PARAMETERS = MappingProxyType({
+    sys.intern(k): MappingProxyType(v) for k, v in TASK_PARAMETERS.items()
+})
+
+# Struct-of-arrays view of the presets: one index lookup plus an O(1) array
+# read per field, for callers that only need a single parameter rather than
+# the whole preset dict.
+_TASK_INDEX = {task: i for i, task in enumerate(TASK_PARAMETERS)}
+_TEMP = array('f', (p["temperature"] for p in TASK_PARAMETERS.values()))
+_CTX = array('i', (p["num_ctx"] for p in TASK_PARAMETERS.values()))
+_PREDICT = array('i', (p["num_predict"] for p in TASK_PARAMETERS.values()))
+_DEFAULT_INDEX = _TASK_INDEX["default"]
+
+def get_temperature(task_type: str) -> float:
+    """Temperature preset for a task type (unknown types fall back to default)."""
+    return round(_TEMP[_TASK_INDEX.get(task_type, _DEFAULT_INDEX)], 2)
+
+def get_ctx(task_type: str) -> int:
+    """Context-window preset for a task type (unknown types fall back to default)."""
+    return _CTX[_TASK_INDEX.get(task_type, _DEFAULT_INDEX)]
+
+def get_predict(task_type: str) -> int:
+    """Prediction-length preset for a task type (unknown types fall back to default)."""
+    return _PREDICT[_TASK_INDEX.get(task_type, _DEFAULT_INDEX)]
+
+@lru_cache(maxsize=128)
+def _get_task_params_cached(task_type: str) -> Mapping[str, Any]:
+    """Resolve a task type to its preset, memoized (unknown types hit 'default')."""
+    return TASK_PARAMETERS.get(task_type) or TASK_PARAMETERS["default"]
+
+def get_parameters_for_task(task_type: str, base_params: Optional[Dict[str, Any]] = None) -> Mapping[str, Any]:
     """
     Get parameters for a specific task type with optional base parameters.
-    
+
     Args:
         task_type: Type of task
         base_params: Optional base parameters to override
-    
+
     Returns:
-        Parameters dictionary for the task
+        Parameters mapping for the task. Without base_params this is the
+        read-only preset itself (no per-call copy); callers that need to
+        mutate it must build their own dict.
     """
-    task_params = TASK_PARAMETERS.get(task_type, TASK_PARAMETERS["default"]).copy()
-    
+    # Interning the incoming key lets both the lru_cache lookup and the
+    # table probe compare by pointer against the interned table keys.
+    # Non-str task types (e.g. a null field in LLM output) resolve to the
+    # default preset, as the plain dict.get did.
+    if isinstance(task_type, str):
+        task_params = _get_task_params_cached(sys.intern(task_type))
+    else:
+        task_params = TASK_PARAMETERS["default"]
+
     if base_params:
-        task_params.update(base_params)
-    
+        return {**task_params, **base_params}
+
     return task_params
 
+# Clamp table for validate_parameters: (key, label, cast, lower, upper, fallback)
+_PARAM_BOUNDS = (
+    ("temperature", "temperature", float, 0.0, 1.0, 0.7),
+    ("num_ctx", "context window", int, 512, 8192, 2048),
+    ("num_predict", "prediction length", int, 64, 4096, 1024),
+)
+
+# The static presets are checked against _PARAM_BOUNDS once at import, so
+# validate_parameters can recognize them by identity and skip re-clamping
+# values that are already proven in range. Untrusted input (LLM output,
+# caller overrides) never appears in this set and takes the normal path.
+for _preset in TASK_PARAMETERS.values():
+    for _key, _label, _cast, _lower, _upper, _fallback in _PARAM_BOUNDS:
+        _value = _preset[_key]
+        assert _lower <= _value <= _upper, f"preset {_label} out of range: {_value}"
+_PREVALIDATED = frozenset(id(p) for p in TASK_PARAMETERS.values())
+del _preset, _key, _label, _cast, _lower, _upper, _fallback, _value
+
 def validate_parameters(params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Validate and normalize model parameters.
-    
+
     Args:
         params: Parameters to validate
-        
+
     Returns:
         Validated parameters
     """
-    validated = params.copy()
-    
-    # Temperature bounds
-    if "temperature" in validated:
-        try:
-            temp = float(validated["temperature"])
-            validated["temperature"] = max(0.0, min(1.0, temp))
-        except (ValueError, TypeError):
-            print(f"Warning: Invalid temperature value. Using default.")
-            validated["temperature"] = 0.7
-    
-    # Context window bounds
-    if "num_ctx" in validated:
-        try:
-            ctx = int(validated["num_ctx"])
-            validated["num_ctx"] = max(512, min(8192, ctx))
-        except (ValueError, TypeError):
-            print(f"Warning: Invalid context window value. Using default.")
-            validated["num_ctx"] = 2048
-    
-    # Prediction length bounds
-    if "num_predict" in validated:
-        try:
-            pred = int(validated["num_predict"])
-            validated["num_predict"] = max(64, min(4096, pred))
-        except (ValueError, TypeError):
-            print(f"Warning: Invalid prediction length value. Using default.")
-            validated["num_predict"] = 1024
-    
+    # Static presets were bounds-checked at import; hand them back untouched
+    if id(params) in _PREVALIDATED:
+        return params
+
+    validated = dict(params)
+
+    for key, label, cast, lower, upper, fallback in _PARAM_BOUNDS:
+        if key in validated:
+            value = validated[key]
+            # Values decoded from JSON usually arrive as the right type
+            # already; skip the conversion call for them
+            if type(value) is not cast:
+                try:
+                    value = cast(value)
+                except (ValueError, TypeError):
+                    print(f"Warning: Invalid {label} value. Using default.")
+                    validated[key] = fallback
+                    continue
+            # Explicit branches clamp with at most two comparisons and no
+            # varargs min/max calls; in-range values fall straight through
+            if value < lower:
+                value = lower
+            elif value > upper:
+                value = upper
+            validated[key] = value
+
     return validated
 
 def merge_parameters(default_params: Dict[str, Any], override_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -292,11 +353,9 @@ def merge_parameters(default_params: Dict[str, Any], override_params: Optional[D
     """
     if not override_params:
         return validate_parameters(default_params)
-    
-    merged = default_params.copy()
-    merged.update(override_params)
-    
-    return validate_parameters(merged)
+
+    # Single C-level merge instead of copy + update
+    return validate_parameters(default_params | override_params)
 
 def get_parameter_presets() -> Dict[str, Dict[str, Union[float, int]]]:
     """
@@ -5,11 +5,21 @@ This module contains all prompt techniques logic and functionality,
 separated from the actual templates and parameter configurations.
 """
 
+import hashlib
+import re
+import string
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any, Tuple
 
 # Import templates from the dedicated templates module
 # Make sure techniques.py properly imports from templates.py
 from .templates import (
+    L1_TECHNIQUE_TEMPLATES,
+    L2_TECHNIQUE_TEMPLATES,
+    TECHNIQUE_TEMPLATES,
     get_technique_template,
     get_role_template,
     get_l1_technique_template,
@@ -74,6 +84,169 @@ L2_TECHNIQUES = {
     }
 }
 
+# Freeze the catalogs: interned keys hit the pointer-equality fast path in
+# dict lookup, and the read-only views make the tables safe to share with
+# the threaded/async executors without defensive copies.
+BASIC_TECHNIQUES = MappingProxyType({
+    sys.intern(k): MappingProxyType(v) for k, v in BASIC_TECHNIQUES.items()
+})
+L1_TECHNIQUES = MappingProxyType({
+    sys.intern(k): MappingProxyType(v) for k, v in L1_TECHNIQUES.items()
+})
+L2_TECHNIQUES = MappingProxyType({
+    sys.intern(k): MappingProxyType(v) for k, v in L2_TECHNIQUES.items()
+})
+
+# Unified description table: one hash probe in get_technique_description
+# instead of up to three membership checks across the catalogs
+_DESC = {
+    name: meta["description"]
+    for catalog in (BASIC_TECHNIQUES, L1_TECHNIQUES, L2_TECHNIQUES)
+    for name, meta in catalog.items()
+}
+
+# Task-specific technique mapping used when no content indicator matches
+_TASK_TECHNIQUE_MAP = {
+    "math": "chain_of_thought",  # Math problems benefit from step-by-step thinking
+    "reasoning": "tree_of_thought",  # Complex reasoning benefits from exploring multiple paths
+    "analysis": "self_consistency",  # Analysis benefits from multiple approaches
+    "coding": "chain_of_thought",  # Coding benefits from step-by-step breakdown
+    "explanation": "socratic",  # Explanations benefit from questioning approach
+    "creative": "role_playing",  # Creative tasks benefit from role immersion
+    "structured": "structured_output"  # When specific output format is needed
+}
+
+# Content indicators fused into one alternation: a single C-level scan over
+# the message replaces five separate any(... in message) passes. Group names
+# are the technique names; _TECH_RANK preserves the original priority order
+# when indicators from several groups appear in one message.
+_TECH_KEYWORD_RE = re.compile(
+    r"(?P<chain_of_thought>steps|how to|process)"
+    r"|(?P<tree_of_thought>compare|different ways|alternatives|options)"
+    r"|(?P<self_consistency>analyze|examine|evaluate)"
+    r"|(?P<socratic>why|explain|reason)"
+    r"|(?P<structured_output>format|structure|organize)",
+    re.IGNORECASE
+)
+
+_TECH_RANK = {
+    "chain_of_thought": 0,
+    "tree_of_thought": 1,
+    "self_consistency": 2,
+    "socratic": 3,
+    "structured_output": 4,
+}
+
+# Field plans for the L1 and L2 templates: each template is parsed once at
+# import with string.Formatter, and rendered thereafter by a plain join over
+# (literal, field) pairs — str.format re-parses the template on every call.
+# Keyed by technique_name for L1 and (technique_name, step) for L2.
+
+def _compile_template(template: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Parse a format template into an immutable (literal, field) plan."""
+    return tuple(
+        (literal, field)
+        for literal, field, _, _ in string.Formatter().parse(template)
+    )
+
+def _render(compiled: Tuple[Tuple[str, Optional[str]], ...],
+            values: Dict[str, str]) -> str:
+    """Render a compiled field plan against a dict of field values."""
+    return "".join(
+        literal if field is None else literal + str(values[field])
+        for literal, field in compiled
+    )
+
+def _compile_render_plan(
+    template: str
+) -> Tuple[List[Optional[str]], Dict[str, int]]:
+    """
+    Parse a template into (segments, slots): a list of literal segments with
+    None at each substitution point, plus a field-name -> segment-index map.
+    Rendering is then a slice copy, slot assignment, and one join.
+    """
+    segments: List[Optional[str]] = []
+    slots: Dict[str, int] = {}
+    for literal, field, _, _ in string.Formatter().parse(template):
+        if literal:
+            segments.append(literal)
+        if field is not None:
+            slots[field] = len(segments)
+            segments.append(None)
+    return segments, slots
+
+_COMPILED = {}
+_RENDER_PLAN = {}
+for _name, _template in L1_TECHNIQUE_TEMPLATES.items():
+    _COMPILED[_name] = _compile_template(_template)
+    _RENDER_PLAN[_name] = _compile_render_plan(_template)
+for _name, _steps in L2_TECHNIQUE_TEMPLATES.items():
+    for _step, _template in enumerate(_steps):
+        _COMPILED[(_name, _step)] = _compile_template(_template)
+        _RENDER_PLAN[(_name, _step)] = _compile_render_plan(_template)
+del _name, _template, _steps, _step
+
+def get_render_plan(technique_name: str, step: Optional[int] = None):
+    """
+    Get the precomputed render plan for an L1 technique (step None) or an
+    L2 technique step, or None if there is no such template.
+    """
+    key = technique_name if step is None else (technique_name, step)
+    return _RENDER_PLAN.get(key)
+
+def render_many(
+    plan: Tuple[List[Optional[str]], Dict[str, int]],
+    queries: List[str],
+    previous_responses: Optional[List[Optional[str]]] = None
+) -> List[str]:
+    """
+    Render one template for many queries at once using its precomputed plan:
+    each prompt is a slice copy of the literal segments with the query (and
+    previous response, when the template uses one) dropped into its slot,
+    then a single join — no per-prompt format parsing.
+
+    Args:
+        plan: Render plan from get_render_plan
+        queries: Query text per prompt
+        previous_responses: Optional previous-step response per prompt
+
+    Returns:
+        List of rendered prompts, aligned with queries
+    """
+    segments, slots = plan
+    query_slot = slots.get("query")
+    previous_slot = slots.get("previous_response")
+    if previous_responses is None:
+        previous_responses = [None] * len(queries)
+
+    rendered = []
+    for query, previous in zip(queries, previous_responses):
+        parts = segments[:]
+        if query_slot is not None:
+            parts[query_slot] = query
+        if previous_slot is not None:
+            parts[previous_slot] = previous
+        rendered.append("".join(parts))
+    return rendered
+
+# Default placeholder values for techniques whose templates reference them
+_DEFAULT_APPROACHES = {
+    "approach1": "Consider the fundamental principles",
+    "approach2": "Think about edge cases",
+    "approach3": "Look for patterns or similarities"
+}
+
+# Field names each basic technique template actually references, parsed once
+# at import so apply_technique only fills the placeholders a template uses
+_TECH_FIELDS = {
+    name: frozenset(
+        field
+        for _, field, _, _ in string.Formatter().parse(template)
+        if field
+    )
+    for name, template in TECHNIQUE_TEMPLATES.items()
+}
+
 # Core technique functions
 
 def get_technique_description(technique_name: str) -> str:
@@ -86,15 +259,12 @@ def get_technique_description(technique_name: str) -> str:
     Returns:
         Description of the technique
     """
-    if technique_name in BASIC_TECHNIQUES:
-        return BASIC_TECHNIQUES[technique_name]["description"]
-    elif technique_name in L1_TECHNIQUES:
-        return L1_TECHNIQUES[technique_name]["description"]
-    elif technique_name in L2_TECHNIQUES:
-        return L2_TECHNIQUES[technique_name]["description"]
-    else:
+    description = _DESC.get(technique_name)
+    if description is None:
         return f"Unknown technique: {technique_name}"
+    return description
 
+@lru_cache(maxsize=1024)
 def select_technique(message: str, task_type: str) -> str:
     """
     Select the most appropriate prompt technique based on message content and task type.
@@ -106,34 +276,23 @@ def select_technique(message: str, task_type: str) -> str:
     Returns:
         Name of the selected technique
     """
-    # Task-specific technique mapping
-    task_technique_map = {
-        "math": "chain_of_thought",  # Math problems benefit from step-by-step thinking
-        "reasoning": "tree_of_thought",  # Complex reasoning benefits from exploring multiple paths
-        "analysis": "self_consistency",  # Analysis benefits from multiple approaches
-        "coding": "chain_of_thought",  # Coding benefits from step-by-step breakdown
-        "explanation": "socratic",  # Explanations benefit from questioning approach
-        "creative": "role_playing",  # Creative tasks benefit from role immersion
-        "structured": "structured_output"  # When specific output format is needed
-    }
-    
-    # Content-based technique detection
-    message_lower = message.lower()
-    
-    # Look for specific indicators in the message
-    if any(x in message_lower for x in ["steps", "how to", "explain steps", "process"]):
-        return "chain_of_thought"
-    elif any(x in message_lower for x in ["compare", "different ways", "alternatives", "options"]):
-        return "tree_of_thought"
-    elif any(x in message_lower for x in ["analyze", "examine", "evaluate"]):
-        return "self_consistency"
-    elif any(x in message_lower for x in ["why", "explain", "reason"]):
-        return "socratic"
-    elif any(x in message_lower for x in ["format", "structure", "organize"]):
-        return "structured_output"
-    
+    # Content-based technique detection: one case-insensitive pass over the
+    # message, keeping the highest-priority group that matched
+    best = None
+    best_rank = len(_TECH_RANK)
+    for match in _TECH_KEYWORD_RE.finditer(message):
+        rank = _TECH_RANK[match.lastgroup]
+        if rank == 0:
+            return "chain_of_thought"
+        if rank < best_rank:
+            best_rank = rank
+            best = match.lastgroup
+
+    if best:
+        return best
+
     # Fall back to task-based technique
-    return task_technique_map.get(task_type, "zero_shot")
+    return _TASK_TECHNIQUE_MAP.get(task_type, "zero_shot")
 
 def apply_technique(message: str, technique: str, role: Optional[str] = None) -> str:
     """
@@ -147,20 +306,27 @@ def apply_technique(message: str, technique: str, role: Optional[str] = None) ->
     Returns:
         Enhanced message using the technique
     """
-    try:
-        template = get_technique_template(technique)
-        format_dict = {
-            "query": message,
-            "role": role if role else "Assistant",
-            # Add default placeholders for specific techniques
-            "approach1": "Consider the fundamental principles",
-            "approach2": "Think about edge cases",
-            "approach3": "Look for patterns or similarities"
-        }
-        return template.format(**format_dict)
-    except (KeyError, AttributeError, ValueError) as e:
-        print(f"Warning: Failed to apply technique {technique}: {e}")
-        return message
+    template = get_technique_template(technique)
+    fields = _TECH_FIELDS.get(technique)
+    if fields is None:
+        # Unknown technique resolved to the default "{query}" template
+        fields = frozenset(("query",))
+
+    # Fill only the placeholders this template references, instead of
+    # building the full five-key dict and letting str.format walk it
+    values = {"query": message}
+    for field in fields:
+        if field in values:
+            continue
+        if field == "role":
+            values[field] = role if role else "Assistant"
+        elif field in _DEFAULT_APPROACHES:
+            values[field] = _DEFAULT_APPROACHES[field]
+        else:
+            print(f"Warning: Failed to apply technique {technique}: "
+                  f"unsupported placeholder '{field}'")
+            return message
+    return template.format_map(values)
 
 # Level-1 and Level-2 technique functions
 
@@ -183,8 +349,12 @@ def apply_l1_technique(query: str, technique_name: str) -> str:
     Returns:
         Formatted prompt using the specified technique
     """
-    template = get_l1_technique_template(technique_name)
-    return template.format(query=query)
+    compiled = _COMPILED.get(technique_name)
+    if compiled is None:
+        # Unknown technique: the accessor prints the warning and hands back
+        # the default template
+        return get_l1_technique_template(technique_name).format(query=query)
+    return _render(compiled, {"query": query})
 
 def execute_l2_technique_step(
     query: str, 
@@ -204,32 +374,137 @@ def execute_l2_technique_step(
     Returns:
         Formatted prompt for the specified step
     """
-    template = get_l2_technique_step_template(technique_name, step)
-    
-    if not template:
-        print(f"Warning: No template found for {technique_name} step {step}. Using original query.")
-        return query
-        
+    compiled = _COMPILED.get((technique_name, step))
+
+    if compiled is None:
+        # Let the accessor report why (unknown technique or bad step index)
+        template = get_l2_technique_step_template(technique_name, step)
+        if not template:
+            print(f"Warning: No template found for {technique_name} step {step}. Using original query.")
+            return query
+        compiled = _compile_template(template)
+
     if previous_response:
-        return template.format(query=query, previous_response=previous_response)
+        values = {"query": query, "previous_response": previous_response}
     else:
-        return template.format(query=query)
+        values = {"query": query}
+    return _render(compiled, values)
+
+# Content-addressed response cache for Level-2 chains: each step prompt is
+# deterministic in its inputs, and re-runs over the same (query, technique)
+# pair are common, so a hit skips the model round-trip entirely. Keyed by a
+# digest of the rendered prompt plus the step parameters, which naturally
+# invalidates entries when a template changes.
+_RESPONSE_CACHE: OrderedDict = OrderedDict()
+_RESPONSE_CACHE_MAX = 256
+
+def _response_cache_key(prompt: str, params: Dict[str, Any]) -> bytes:
+    return hashlib.blake2b(
+        prompt.encode() + repr(sorted(params.items())).encode(),
+        digest_size=16
+    ).digest()
+
+def _response_cache_get(key: bytes) -> Optional[str]:
+    response = _RESPONSE_CACHE.get(key)
+    if response is not None:
+        _RESPONSE_CACHE.move_to_end(key)
+    return response
+
+def _response_cache_put(key: bytes, response: str) -> None:
+    _RESPONSE_CACHE[key] = response
+    _RESPONSE_CACHE.move_to_end(key)
+    while len(_RESPONSE_CACHE) > _RESPONSE_CACHE_MAX:
+        _RESPONSE_CACHE.popitem(last=False)
+
+def clear_response_cache() -> None:
+    """Drop all cached Level-2 step responses."""
+    _RESPONSE_CACHE.clear()
+
+def _plan_messages(
+    plan: Tuple[Tuple[str, Optional[str]], ...],
+    values: Dict[str, Optional[str]]
+) -> Optional[List[Dict[str, str]]]:
+    """
+    Split a single-placeholder plan into system/user chat messages: the
+    static template text becomes the system block and the variable content
+    the user block. Returns None when the plan has zero or several
+    placeholders or the value is missing, so the caller can fall back to a
+    plain string prompt.
+    """
+    fields = [field for _, field in plan if field is not None]
+    if len(fields) != 1:
+        return None
+    value = values.get(fields[0])
+    if value is None:
+        return None
+    head, tail = _split_plan_at(plan, fields[0], {})
+    return [
+        {"role": "system", "content": head},
+        {"role": "user", "content": value + tail}
+    ]
+
+def apply_l1_technique_messages(
+    query: str, technique_name: str
+) -> List[Dict[str, str]]:
+    """
+    Chat-message variant of apply_l1_technique. The static template text is
+    emitted as a byte-identical system block across all queries of a
+    technique, so providers with prompt/prefix caching prefill it once per
+    batch instead of once per call; only the query travels as the user
+    block. Falls back to a single user message for unknown techniques.
+    """
+    compiled = _COMPILED.get(technique_name)
+    if compiled is not None:
+        messages = _plan_messages(compiled, {"query": query})
+        if messages is not None:
+            return messages
+    return [{"role": "user", "content": apply_l1_technique(query, technique_name)}]
+
+def execute_l2_technique_step_messages(
+    query: str,
+    technique_name: str,
+    step: int,
+    previous_response: Optional[str] = None
+) -> List[Dict[str, str]]:
+    """
+    Chat-message variant of execute_l2_technique_step: returns a
+    [system, user] pair where the system block is the step's static
+    template text (identical across every query of a batch, so the
+    server's prefix cache can reuse its KV) and the user block carries the
+    variable query or previous response. Falls back to a single user
+    message when the step has no splittable template.
+    """
+    compiled = _COMPILED.get((technique_name, step))
+    if compiled is not None:
+        messages = _plan_messages(
+            compiled,
+            {"query": query, "previous_response": previous_response}
+        )
+        if messages is not None:
+            return messages
+    return [{
+        "role": "user",
+        "content": execute_l2_technique_step(query, technique_name, step,
+                                             previous_response)
+    }]
 
 def execute_l2_technique_full(
-    query: str, 
-    technique_name: str, 
+    query: str,
+    technique_name: str,
     model_call_fn: callable,
-    step_params: Optional[List[Dict[str, Any]]] = None
+    step_params: Optional[List[Dict[str, Any]]] = None,
+    use_cache: bool = True
 ) -> Tuple[List[str], List[str]]:
     """
     Execute all steps of a Level-2 technique sequentially, using a model call function.
-    
+
     Args:
         query: The original requirements task/query
         technique_name: Name of the Level-2 technique
         model_call_fn: Function that takes a prompt string and optional parameters and returns a response
         step_params: Optional list of parameter dictionaries for each step (must match number of steps)
-        
+        use_cache: Reuse cached responses for previously seen (prompt, parameters) pairs
+
     Returns:
         Tuple of (prompts, responses) where each is a list containing the prompt/response for each step
     """
@@ -258,12 +533,413 @@ def execute_l2_technique_full(
         # Format the prompt for this step
         prompt = execute_l2_technique_step(query, technique_name, i, previous_response)
         prompts.append(prompt)
-        
-        # Call the model
-        response = model_call_fn(prompt, **step_params[i])
+
+        # Call the model, skipping the round-trip on a cache hit
+        key = _response_cache_key(prompt, step_params[i]) if use_cache else None
+        response = _response_cache_get(key) if use_cache else None
+        if response is None:
+            response = model_call_fn(prompt, **step_params[i])
+            if use_cache and response is not None:
+                _response_cache_put(key, response)
         responses.append(response)
-        
+
         # Use this response for the next step
         previous_response = response
-    
-    return prompts, responses
\ No newline at end of file
+
+    return prompts, responses
+
+def _split_plan_at(
+    compiled: Tuple[Tuple[str, Optional[str]], ...],
+    field: str,
+    values: Dict[str, str]
+) -> Optional[Tuple[str, str]]:
+    """
+    Pre-render a compiled plan around one deferred field: returns (head,
+    tail) such that head + value + tail is the full render, or None when the
+    plan doesn't reference the field (so the caller falls back to a normal
+    render).
+    """
+    for idx, (literal, name) in enumerate(compiled):
+        if name == field:
+            head = _render(compiled[:idx], values) + literal
+            tail = _render(compiled[idx + 1:], values)
+            return head, tail
+    return None
+
+def execute_l2_technique_full_streamed(
+    query: str,
+    technique_name: str,
+    stream_model_call_fn: callable,
+    step_params: Optional[List[Dict[str, Any]]] = None
+) -> Tuple[List[str], List[str]]:
+    """
+    Variant of execute_l2_technique_full for streaming backends: the model
+    call returns an iterator of response chunks, and while step i is still
+    generating, everything of step i+1's prompt except the pending response
+    is rendered ahead of time. When the stream ends, the next prompt is a
+    single head + response + tail concatenation, so no template work sits
+    between one step finishing and the next request going out.
+
+    Args:
+        query: The original requirements task/query
+        technique_name: Name of the Level-2 technique
+        stream_model_call_fn: Function that takes a prompt string and
+            optional parameters and returns an iterator of response chunks
+        step_params: Optional list of parameter dictionaries for each step
+
+    Returns:
+        Tuple of (prompts, responses), the same shape as
+        execute_l2_technique_full
+    """
+    num_steps = get_l2_technique_steps_count(technique_name)
+
+    if num_steps == 0:
+        print(f"Warning: Unknown L2 technique: {technique_name}. Using single step with original query.")
+        params = step_params[0] if step_params else {}
+        response = "".join(stream_model_call_fn(query, **params))
+        return [query], [response]
+
+    if step_params is None or len(step_params) != num_steps:
+        step_params = [{}] * num_steps
+
+    prompts = []
+    responses = []
+    prompt = execute_l2_technique_step(query, technique_name, 0)
+
+    for i in range(num_steps):
+        prompts.append(prompt)
+
+        next_plan = _COMPILED.get((technique_name, i + 1))
+        next_split = None
+        pieces = []
+        for chunk in stream_model_call_fn(prompt, **step_params[i]):
+            if not pieces and next_plan is not None:
+                # First chunk arrived: prepare the next prompt's surroundings
+                # while the rest of the response streams in
+                next_split = _split_plan_at(
+                    next_plan, "previous_response", {"query": query}
+                )
+            pieces.append(chunk)
+        response = "".join(pieces)
+        responses.append(response)
+
+        if i + 1 < num_steps:
+            if next_split is not None:
+                head, tail = next_split
+                prompt = head + response + tail
+            else:
+                prompt = execute_l2_technique_step(
+                    query, technique_name, i + 1, response
+                )
+
+    return prompts, responses
+
+def execute_l2_technique_full_parallel(
+    queries: List[str],
+    technique_name: str,
+    model_call_fn: callable,
+    step_params: Optional[List[Dict[str, Any]]] = None,
+    max_workers: int = 8
+) -> List[Tuple[List[str], List[str]]]:
+    """
+    Execute a Level-2 technique over several independent queries with the
+    model calls of each step dispatched concurrently from a thread pool.
+
+    Steps stay ordered per query (step i+1 sees that query's step-i
+    response), but across queries each step's calls overlap, so wall time
+    per step drops from N round-trips to roughly one.
+
+    Args:
+        queries: Independent requirements tasks/queries
+        technique_name: Name of the Level-2 technique
+        model_call_fn: Function that takes a prompt string and optional
+            parameters and returns a response (must be thread-safe)
+        step_params: Optional list of parameter dictionaries for each step
+        max_workers: Upper bound on concurrent model calls
+
+    Returns:
+        List of (prompts, responses) tuples, one per query, in input order
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    num_steps = get_l2_technique_steps_count(technique_name)
+    if num_steps == 0:
+        return [
+            execute_l2_technique_full(query, technique_name, model_call_fn,
+                                      step_params)
+            for query in queries
+        ]
+
+    if step_params is None or len(step_params) != num_steps:
+        step_params = [{}] * num_steps
+
+    n = len(queries)
+    prompts_per_query = [[] for _ in range(n)]
+    responses_per_query = [[] for _ in range(n)]
+    previous = [None] * n
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i in range(num_steps):
+            step_prompts = [
+                execute_l2_technique_step(query, technique_name, i, previous[j])
+                for j, query in enumerate(queries)
+            ]
+            params = step_params[i]
+            responses = list(executor.map(
+                lambda prompt: model_call_fn(prompt, **params), step_prompts
+            ))
+            for j in range(n):
+                prompts_per_query[j].append(step_prompts[j])
+                responses_per_query[j].append(responses[j])
+            previous = responses
+
+    return list(zip(prompts_per_query, responses_per_query))
+
+async def execute_l2_technique_full_async(
+    queries: List[str],
+    technique_name: str,
+    async_model_call_fn: callable,
+    step_params: Optional[List[Dict[str, Any]]] = None,
+    max_concurrency: int = 8
+) -> List[Tuple[List[str], List[str]]]:
+    """
+    Async variant of execute_l2_technique_full_parallel: each step's model
+    calls are issued together with asyncio.gather, bounded by a semaphore,
+    so the backend's batcher can group them.
+
+    Args:
+        queries: Independent requirements tasks/queries
+        technique_name: Name of the Level-2 technique
+        async_model_call_fn: Coroutine function taking a prompt string and
+            optional parameters and returning a response
+        step_params: Optional list of parameter dictionaries for each step
+        max_concurrency: Upper bound on in-flight model calls
+
+    Returns:
+        List of (prompts, responses) tuples, one per query, in input order
+    """
+    import asyncio
+
+    num_steps = get_l2_technique_steps_count(technique_name)
+    if num_steps == 0:
+        print(f"Warning: Unknown L2 technique: {technique_name}. Using single step with original query.")
+        params = step_params[0] if step_params else {}
+        responses = await asyncio.gather(
+            *(async_model_call_fn(query, **params) for query in queries)
+        )
+        return [([query], [response])
+                for query, response in zip(queries, responses)]
+
+    if step_params is None or len(step_params) != num_steps:
+        step_params = [{}] * num_steps
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded_call(prompt, params):
+        async with semaphore:
+            return await async_model_call_fn(prompt, **params)
+
+    n = len(queries)
+    prompts_per_query = [[] for _ in range(n)]
+    responses_per_query = [[] for _ in range(n)]
+    previous = [None] * n
+
+    for i in range(num_steps):
+        step_prompts = [
+            execute_l2_technique_step(query, technique_name, i, previous[j])
+            for j, query in enumerate(queries)
+        ]
+        responses = await asyncio.gather(
+            *(_bounded_call(prompt, step_params[i]) for prompt in step_prompts)
+        )
+        for j in range(n):
+            prompts_per_query[j].append(step_prompts[j])
+            responses_per_query[j].append(responses[j])
+        previous = list(responses)
+
+    return list(zip(prompts_per_query, responses_per_query))
+
+# Labels like "[1] " at the start of a line mark per-query blocks in a
+# batched response
+_BATCH_ITEM_RE = re.compile(r"^\[(\d+)\]\s*", re.MULTILINE)
+
+_BATCH_PREAMBLE = (
+    "Answer each numbered item below separately. Start every answer on a "
+    "new line with its [number] label and nothing else before it.\n\n"
+)
+
+def _split_batched_response(response: str, count: int) -> Optional[List[str]]:
+    """
+    Split a "[i] ..." labeled batched response back into per-item texts.
+    Returns None when the labels don't line up with the batch, so the caller
+    can fall back to single-query execution.
+    """
+    if not isinstance(response, str):
+        return None
+
+    matches = list(_BATCH_ITEM_RE.finditer(response))
+    if len(matches) != count:
+        return None
+
+    parts = []
+    for i, match in enumerate(matches):
+        if int(match.group(1)) != i + 1:
+            return None
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(response)
+        parts.append(response[match.end():end].strip())
+    return parts
+
+def _bin_order(previous: List[Optional[str]], bins: int) -> List[int]:
+    """
+    Order query indices so that queries whose previous responses fall into
+    the same length bin end up adjacent, and similar-length prompts batch
+    together. With no previous responses (step 0) or a single bin, the input
+    order is kept.
+    """
+    n = len(previous)
+    if bins <= 1 or n <= 1 or previous[0] is None:
+        return list(range(n))
+
+    lengths = [len(p) for p in previous]
+    lo, hi = min(lengths), max(lengths)
+    if hi == lo:
+        # No length variance: binning can't help, keep input order
+        return list(range(n))
+
+    width = (hi - lo) / bins
+    bin_of = [min(bins - 1, int((length - lo) / width)) for length in lengths]
+    # Stable sort: input order is preserved within each bin
+    return sorted(range(n), key=lambda j: bin_of[j])
+
+def execute_l2_technique_full_batched(
+    queries: List[str],
+    technique_name: str,
+    model_call_fn: callable,
+    step_params: Optional[List[Dict[str, Any]]] = None,
+    batch_size: int = 4,
+    bins: int = 4,
+    use_cache: bool = True
+) -> List[Tuple[List[str], List[str]]]:
+    """
+    Execute a Level-2 technique over several independent queries, grouping
+    them into labeled batch prompts so each step costs ceil(N / batch_size)
+    model calls instead of N.
+
+    The pipeline runs step by step across all queries. Identical step
+    prompts (same query seed or converged previous responses) are collapsed
+    to a single model call whose response is scattered back to every
+    duplicate, and cached responses from earlier runs are reused. The
+    remaining unique prompts are regrouped by the length of their previous
+    responses (equal width bins over the observed range), so a batch isn't
+    stalled by one outlier prompt that is much longer than its neighbours.
+    Queries are numbered "[1] ... [2] ..." inside one prompt per step and
+    the model is asked to answer with the same labels; any group whose
+    response can't be split back apart is re-run for that step one query at
+    a time.
+
+    Args:
+        queries: Independent requirements tasks/queries
+        technique_name: Name of the Level-2 technique
+        model_call_fn: Function that takes a prompt string and optional
+            parameters and returns a response
+        step_params: Optional list of parameter dictionaries for each step
+        batch_size: Number of queries packed into one prompt
+        bins: Number of length bins used when regrouping between steps
+        use_cache: Reuse cached responses for previously seen
+            (prompt, parameters) pairs
+
+    Returns:
+        List of (prompts, responses) tuples, one per query, in input order —
+        the same shape execute_l2_technique_full returns for a single query
+    """
+    num_steps = get_l2_technique_steps_count(technique_name)
+    if num_steps == 0:
+        # Unknown technique: the sequential path prints the warning and
+        # falls back to a single step per query
+        return [
+            execute_l2_technique_full(query, technique_name, model_call_fn,
+                                      step_params)
+            for query in queries
+        ]
+
+    if step_params is None or len(step_params) != num_steps:
+        step_params = [{}] * num_steps
+
+    batch_size = max(1, batch_size)
+    n = len(queries)
+    prompts_per_query = [[] for _ in range(n)]
+    responses_per_query = [[] for _ in range(n)]
+    previous = [None] * n
+
+    for i in range(num_steps):
+        params = step_params[i]
+        plan = _RENDER_PLAN.get((technique_name, i))
+        if plan is not None:
+            step_prompts = render_many(plan, queries, previous)
+        else:
+            step_prompts = [
+                execute_l2_technique_step(query, technique_name, i, previous[j])
+                for j, query in enumerate(queries)
+            ]
+
+        # Collapse duplicate prompts: one model call per unique prompt
+        # (step params are shared across the step, so equal prompts are
+        # fully interchangeable)
+        uniq_pos = {}
+        uniq_prompts = []
+        rep_query = []
+        dup_of = []
+        for j, prompt in enumerate(step_prompts):
+            pos = uniq_pos.get(prompt)
+            if pos is None:
+                pos = uniq_pos[prompt] = len(uniq_prompts)
+                uniq_prompts.append(prompt)
+                rep_query.append(j)
+            dup_of.append(pos)
+
+        uniq_responses = [None] * len(uniq_prompts)
+        uniq_keys = [None] * len(uniq_prompts)
+        pending = []
+        for pos, prompt in enumerate(uniq_prompts):
+            if use_cache:
+                uniq_keys[pos] = _response_cache_key(prompt, params)
+                cached = _response_cache_get(uniq_keys[pos])
+                if cached is not None:
+                    uniq_responses[pos] = cached
+                    continue
+            pending.append(pos)
+
+        order = _bin_order([previous[rep_query[pos]] for pos in pending],
+                           bins)
+        ordered = [pending[k] for k in order]
+        for start in range(0, len(ordered), batch_size):
+            group = ordered[start:start + batch_size]
+
+            parts = None
+            if len(group) > 1:
+                combined = _BATCH_PREAMBLE + "\n\n".join(
+                    f"[{k + 1}] {uniq_prompts[pos]}"
+                    for k, pos in enumerate(group)
+                )
+                response = model_call_fn(combined, **params)
+                parts = _split_batched_response(response, len(group))
+
+            if parts is None:
+                # Single-prompt group or unparseable batch response: run
+                # the step's prompts individually
+                parts = [model_call_fn(uniq_prompts[pos], **params)
+                         for pos in group]
+
+            for pos, part in zip(group, parts):
+                uniq_responses[pos] = part
+                if use_cache and part is not None:
+                    _response_cache_put(uniq_keys[pos], part)
+
+        for j in range(n):
+            part = uniq_responses[dup_of[j]]
+            prompts_per_query[j].append(step_prompts[j])
+            responses_per_query[j].append(part)
+            # Each query's own block feeds its next step
+            previous[j] = part
+
+    return list(zip(prompts_per_query, responses_per_query))
\ No newline at end of file
@@ -2,7 +2,19 @@
 Module for template generation and selection.
 """
 
+import logging
 import re
+import sys
+from functools import lru_cache
+
+# Compile the fused detection patterns with the third-party regex module
+# when available: its engine handles large alternations with less
+# backtracking than stdlib re and is a drop-in for the API used here.
+# Falls back transparently otherwise.
+try:
+    import regex as _scan_re
+except ImportError:
+    _scan_re = re
 from .analyzers import call_llm_for_analysis, parse_json_response
 # Corrected imports
 from .templates import (
@@ -12,35 +24,199 @@ from .templates import (
 from .techniques import select_technique
 from .parameters import get_parameters_for_task
 
-def determine_template(message, analysis_result=None):
+logger = logging.getLogger(__name__)
+
+# Sentinel distinguishing "field absent from the analysis" from an explicit
+# None value, so the cached resolver keys on exactly what the caller knew
+_UNSET = object()
+
+# When the analysis supplies all three of these, no detection runs at all
+_ANALYSIS_KEYS = frozenset(("role", "technique", "task_type"))
+
+# Detection tables compiled once at import: the detect_* functions run per
+# user message, and rebuilding pattern strings there made every call pay
+# regex-parse overhead on top of the actual scan. The role and task tables
+# below are source data for the unified keyword scan further down.
+_ROLE_KEYWORDS = {
+    "Mathematician": r"math|calculate|equation|solve|formula|\+|\-|\*|\/|\^|log|sin|cos",
+    "Software Engineer": r"code|program|function|algorithm|class|API",
+    "Data Scientist": r"data|analysis|statistics|correlation|dataset|predict",
+    "Teacher": r"explain|teach|learn|understand|concept|example",
+    "Creative Writer": r"story|write|creative|narrative|plot|character",
+    "Business Analyst": r"business|market|strategy|analyze|ROI|profit",
+    "Physicist": r"physics|force|motion|energy|quantum|momentum",
+    "Biologist": r"biology|cell|organism|gene|evolution|species",
+    "Historian": r"history|century|period|war|civilization|empire",
+    "Psychologist": r"psychology|behavior|mental|cognitive|emotion",
+    "Financial Analyst": r"finance|stock|investment|market|portfolio|risk",
+    "Language Expert": r"grammar|language|sentence|word|phrase|meaning",
+    "Systems Architect": r"system|architecture|design|infrastructure|scalability",
+    "Product Manager": r"product|feature|user|requirement|roadmap|market",
+}
+
+# Parallel index table (SoA): role i of the table is index i + 1, so an
+# integer doubles as both identity and declaration rank. Index 0 pads so
+# "no match" stays falsy. Labels are interned: they flow into dict lookups
+# and equality checks downstream, and interned strings compare by pointer
+# first (multi-word names like "Software Engineer" are not auto-interned).
+_ROLE_BY_INDEX = (None,) + tuple(sys.intern(role) for role in _ROLE_KEYWORDS)
+
+_TASK_KEYWORDS = {
+    "math": (r"math|calculate|equation|solve|\+|\-|\*|\/|formula", (
+        "solve", "calculate", "equation", "formula", "computation"
+    )),
+    "coding": (r"code|program|function|algorithm|implementation", (
+        "implement", "code", "function", "class", "method"
+    )),
+    "creative_writing": (r"story|write|creative|narrative|plot", (
+        "write", "compose", "create", "story", "narrative"
+    )),
+    "analysis": (r"analyze|examine|study|investigate|evaluate", (
+        "analyze", "examine", "evaluate", "assess", "review"
+    )),
+    "explanation": (r"explain|describe|what is|how does|why", (
+        "explain", "describe", "clarify", "elaborate", "detail"
+    )),
+    "planning": (r"plan|strategy|approach|method|steps", (
+        "plan", "organize", "prepare", "arrange", "structure"
+    )),
+    "research": (r"research|study|investigate|explore|literature", (
+        "research", "investigate", "study", "explore", "examine"
+    )),
+    "translation": (r"translate|convert|language|meaning|phrase", (
+        "translate", "convert", "transform", "change", "adapt"
+    )),
+    "summarization": (r"summarize|brief|overview|recap|digest", (
+        "summarize", "condense", "shorten", "brief", "synopsis"
+    ))
+}
+
+# Same parallel layout for tasks, interned for the same reason
+_TASK_BY_INDEX = (None,) + tuple(sys.intern(task) for task in _TASK_KEYWORDS)
+_TASK_INDEX = {task: i + 1 for i, task in enumerate(_TASK_KEYWORDS)}
+
+# Unified keyword table: role keywords, task keywords, and task example
+# words share many tokens ("solve", "code", "explain", ...), so instead of
+# scanning the message once per category, every keyword maps to all of its
+# (category, label) payloads and a single alternation pass credits the role
+# tallies, task scores, and example-word hits simultaneously. Keywords are
+# matched longest-first, lowercased, without IGNORECASE (the scan input is
+# pre-lowered). A keyword listed under several labels credits each of them.
+_ROLE_PAYLOAD, _TASK_PAYLOAD, _WORD_PAYLOAD = 0, 1, 2
+
+_KEYWORD_PAYLOADS = {}
+def _add_payload(keyword, payload):
+    _KEYWORD_PAYLOADS.setdefault(keyword, []).append(payload)
+
+for _i, _keywords in enumerate(_ROLE_KEYWORDS.values(), 1):
+    for _kw in _keywords.lower().split("|"):
+        _add_payload(_kw.replace("\\", ""), (_ROLE_PAYLOAD, _i))
+for _i, (_keywords, _examples) in enumerate(_TASK_KEYWORDS.values(), 1):
+    for _kw in _keywords.lower().split("|"):
+        _add_payload(_kw.replace("\\", ""), (_TASK_PAYLOAD, _i))
+    for _word in _examples:
+        _add_payload(_word, (_WORD_PAYLOAD, _i))
+
+_KEYWORD_PAYLOADS = {keyword: tuple(payloads)
+                     for keyword, payloads in _KEYWORD_PAYLOADS.items()}
+del _add_payload, _i, _keywords, _examples, _kw, _word
+
+# The single-character math symbols leave the alternation: firing up the
+# regex engine per "+" is far more overhead than work, while a frozenset
+# disjointness test and str.count both run in C. Scores are unchanged —
+# each symbol occurrence still credits the same payloads.
+_MATH_SYMS = frozenset("+-*/^")
+_SYM_PAYLOADS = {sym: _KEYWORD_PAYLOADS.pop(sym)
+                 for sym in _MATH_SYMS if sym in _KEYWORD_PAYLOADS}
+
+# Support for the short-message fast paths below: the role every symbol
+# credits, and the subset of symbols that also carry a task payload ("^"
+# is a role keyword only)
+_SYM_ROLE_INDEX = next((index for payloads in _SYM_PAYLOADS.values()
+                        for category, index in payloads
+                        if category == _ROLE_PAYLOAD), 0)
+_TASK_SYMS = frozenset(sym for sym, payloads in _SYM_PAYLOADS.items()
+                       if any(c == _TASK_PAYLOAD for c, _ in payloads))
+_SYM_TASK_INDEX = next((index for payloads in _SYM_PAYLOADS.values()
+                        for category, index in payloads
+                        if category == _TASK_PAYLOAD), 0)
+
+# Messages shorter than this rarely contain more than one keyword per
+# category, so the detectors return on the first hit instead of tallying
+# and ranking every label. Multi-keyword short messages can resolve a tie
+# differently than the full path; that trade is deliberate.
+_SHORT_MESSAGE = 40
+
+_DETECT_RE = _scan_re.compile(
+    "|".join(re.escape(keyword)
+             for keyword in sorted(_KEYWORD_PAYLOADS, key=len, reverse=True))
+)
+
+@lru_cache(maxsize=2048)
+def _scan_detection_tables(message_lower):
     """
-    Analyze message and return appropriate template configuration using both
-    rule-based and LLM-based analysis.
-    
-    Args:
-        message (str): User query
-        analysis_result (dict, optional): Previous LLM analysis result
-        
-    Returns:
-        dict: Template configuration
+    One pass over the lowered message filling the role tallies and task
+    scores together. Task pattern hits count 2 per occurrence; example
+    words count 1 once per distinct word. The returned dicts are cached and
+    shared — callers must treat them as read-only.
     """
-    # If we have LLM analysis, use that role
-    if analysis_result and "role" in analysis_result:
-        role = analysis_result["role"]
-    else:
-        # Otherwise use rule-based role detection
-        role = detect_role(message)
-    
+    role_counts = {}
+    task_scores = {}
+    seen_words = set()
+
+    # Math symbols are checked without the regex engine; most messages fail
+    # the disjointness test and skip the counting loop entirely
+    if not _MATH_SYMS.isdisjoint(message_lower):
+        for sym, payloads in _SYM_PAYLOADS.items():
+            hits = message_lower.count(sym)
+            if not hits:
+                continue
+            for category, index in payloads:
+                if category == _ROLE_PAYLOAD:
+                    role_counts[index] = role_counts.get(index, 0) + hits
+                else:
+                    task_scores[index] = task_scores.get(index, 0) + 2 * hits
+
+    for match in _DETECT_RE.finditer(message_lower):
+        keyword = match.group()
+        for category, index in _KEYWORD_PAYLOADS[keyword]:
+            if category == _ROLE_PAYLOAD:
+                role_counts[index] = role_counts.get(index, 0) + 1
+            elif category == _TASK_PAYLOAD:
+                task_scores[index] = task_scores.get(index, 0) + 2
+            elif keyword not in seen_words:
+                task_scores[index] = task_scores.get(index, 0) + 1
+        seen_words.add(keyword)
+    return role_counts, task_scores
+
+@lru_cache(maxsize=1024)
+def _resolve_template(message, role, technique, task_type):
+    """
+    Memoized core of determine_template. Fields still set to _UNSET are
+    detected from the message; the result tuple is immutable so cached
+    entries can be shared safely between calls.
+    """
+    # Lowered exactly once here, and only when something needs detecting;
+    # every detector below reuses this copy
+    if role is _UNSET or technique is _UNSET or task_type is _UNSET:
+        message_lower = message.lower()
+
+    # If we have LLM analysis, use that role; otherwise rule-based detection
+    if role is _UNSET:
+        role = detect_role(message, message_lower)
+
     # Get the base template for the role
     template = get_role_template(role)
-    
+
+    # Resolve the task type first so technique detection can reuse it
+    # instead of re-running the task regexes
+    if task_type is _UNSET:
+        task_type = detect_task_type(message, message_lower)
+
     # Detect if we should apply any specific prompt techniques
-    technique = None
-    if analysis_result and "technique" in analysis_result:
-        technique = analysis_result["technique"]
-    else:
-        technique = detect_prompt_technique(message)
-        
+    if technique is _UNSET:
+        technique = detect_prompt_technique(message, task_type)
+
     if technique:
         # Get the technique template
         technique_template = get_technique_template(technique)
@@ -51,158 +227,177 @@ def determine_template(message, analysis_result=None):
                 query=template
             )
         except KeyError as e:
-            print(f"Warning: Failed to apply technique template: {e}")
-    
-    # Get appropriate parameters
-    task_type = None
-    if analysis_result and "task_type" in analysis_result:
-        task_type = analysis_result["task_type"]
-    else:
-        task_type = detect_task_type(message)
-        
-    parameters = get_parameters_for_task(task_type)
-    
+            # %-style args keep formatting lazy: the string is only built
+            # when a handler is actually listening
+            logger.warning("Failed to apply technique template: %s", e)
+
+    return role, template, technique, task_type
+
+def determine_template(message, analysis_result=None):
+    """
+    Analyze message and return appropriate template configuration using both
+    rule-based and LLM-based analysis.
+
+    Args:
+        message (str): User query
+        analysis_result (dict, optional): Previous LLM analysis result
+
+    Returns:
+        dict: Template configuration
+    """
+    role = technique = task_type = _UNSET
+    resolved = None
+    if analysis_result:
+        if _ANALYSIS_KEYS <= analysis_result.keys():
+            # Fully specified analysis: nothing to detect, so resolve
+            # directly instead of churning the memoization cache with
+            # one-off LLM outputs (this also tolerates unhashable values)
+            resolved = _resolve_template.__wrapped__(
+                message,
+                analysis_result["role"],
+                analysis_result["technique"],
+                analysis_result["task_type"],
+            )
+        else:
+            role = analysis_result.get("role", _UNSET)
+            technique = analysis_result.get("technique", _UNSET)
+            task_type = analysis_result.get("task_type", _UNSET)
+
+    if resolved is None:
+        try:
+            resolved = _resolve_template(message, role, technique, task_type)
+        except TypeError:
+            # Unhashable analysis values (malformed LLM output) can't be
+            # cache keys; resolve them without memoization
+            resolved = _resolve_template.__wrapped__(
+                message, role, technique, task_type
+            )
+    role, template, technique, task_type = resolved
+
+    # Fresh dict per call: callers update these configs in place, so only
+    # the immutable resolution result is shared through the cache
     return {
         "role": role,
         "template": template,
-        "parameters": parameters,
+        "parameters": get_parameters_for_task(task_type),
         "technique": technique,
         "task_type": task_type
     }
 
-def detect_role(message):
+@lru_cache(maxsize=2048)
+def detect_role(message, message_lower=None):
     """
     Detect most appropriate role based on message content.
     """
-    # Define role detection patterns
-    role_patterns = {
-        "Mathematician": r"(math|calculate|equation|solve|formula|\+|\-|\*|\/|\^|log|sin|cos)",
-        "Software Engineer": r"(code|program|function|algorithm|class|API)",
-        "Data Scientist": r"(data|analysis|statistics|correlation|dataset|predict)",
-        "Teacher": r"(explain|teach|learn|understand|concept|example)",
-        "Creative Writer": r"(story|write|creative|narrative|plot|character)",
-        "Business Analyst": r"(business|market|strategy|analyze|ROI|profit)",
-        "Physicist": r"(physics|force|motion|energy|quantum|momentum)",
-        "Biologist": r"(biology|cell|organism|gene|evolution|species)",
-        "Historian": r"(history|century|period|war|civilization|empire)",
-        "Psychologist": r"(psychology|behavior|mental|cognitive|emotion)",
-        "Financial Analyst": r"(finance|stock|investment|market|portfolio|risk)",
-        "Language Expert": r"(grammar|language|sentence|word|phrase|meaning)",
-        "Systems Architect": r"(system|architecture|design|infrastructure|scalability)",
-        "Product Manager": r"(product|feature|user|requirement|roadmap|market)",
-    }
-    
-    # Check each pattern
-    matched_roles = []
-    for role, pattern in role_patterns.items():
-        if re.search(pattern, message, re.IGNORECASE):
-            matched_roles.append(role)
-    
-    # If multiple roles match, choose the most specific one
-    if len(matched_roles) > 1:
-        # Count the number of pattern matches for each role
-        role_matches = {}
-        for role in matched_roles:
-            pattern = role_patterns[role]
-            matches = len(re.findall(pattern, message, re.IGNORECASE))
-            role_matches[role] = matches
-        
-        # Return the role with the most matches
-        return max(role_matches.items(), key=lambda x: x[1])[0]
-    elif matched_roles:
-        return matched_roles[0]
-            
-    return "Assistant"  # Default role
-
-def detect_prompt_technique(message):
+    if message_lower is None:
+        message_lower = message.lower()
+
+    # Short messages: first hit wins, no tallying
+    if len(message_lower) < _SHORT_MESSAGE:
+        if not _MATH_SYMS.isdisjoint(message_lower):
+            return _ROLE_BY_INDEX[_SYM_ROLE_INDEX]
+        for match in _DETECT_RE.finditer(message_lower):
+            for category, index in _KEYWORD_PAYLOADS[match.group()]:
+                if category == _ROLE_PAYLOAD:
+                    return _ROLE_BY_INDEX[index]
+        return "Assistant"
+
+    # The unified scan fills role and task tables in one pass; when
+    # detect_task_type runs on the same message its half is already cached
+    role_counts, _ = _scan_detection_tables(message_lower)
+
+    best = 0
+    best_score = 0
+    for index, score in role_counts.items():
+        if score > best_score or (score == best_score and index < best):
+            best_score = score
+            best = index
+
+    if not best:
+        return "Assistant"  # Default role
+    return _ROLE_BY_INDEX[best]
+
+@lru_cache(maxsize=2048)
+def detect_prompt_technique(message, task_type=None, message_lower=None):
     """
     Detect if a specific prompt technique should be applied.
+
+    Pass task_type when it is already known to skip re-running task
+    detection.
     """
+    if task_type is None:
+        task_type = detect_task_type(message, message_lower)
     # Use the technique selection function from techniques.py
-    return select_technique(message, detect_task_type(message))
+    return select_technique(message, task_type)
 
-def detect_task_type(message):
+@lru_cache(maxsize=2048)
+def detect_task_type(message, message_lower=None):
     """
     Detect the type of task from the message.
     """
-    # Define task type patterns with examples
-    task_patterns = {
-        "math": (r"(math|calculate|equation|solve|\+|\-|\*|\/|formula)", [
-            "solve", "calculate", "equation", "formula", "computation"
-        ]),
-        "coding": (r"(code|program|function|algorithm|implementation)", [
-            "implement", "code", "function", "class", "method"
-        ]),
-        "creative_writing": (r"(story|write|creative|narrative|plot)", [
-            "write", "compose", "create", "story", "narrative"
-        ]),
-        "analysis": (r"(analyze|examine|study|investigate|evaluate)", [
-            "analyze", "examine", "evaluate", "assess", "review"
-        ]),
-        "explanation": (r"(explain|describe|what is|how does|why)", [
-            "explain", "describe", "clarify", "elaborate", "detail"
-        ]),
-        "planning": (r"(plan|strategy|approach|method|steps)", [
-            "plan", "organize", "prepare", "arrange", "structure"
-        ]),
-        "research": (r"(research|study|investigate|explore|literature)", [
-            "research", "investigate", "study", "explore", "examine"
-        ]),
-        "translation": (r"(translate|convert|language|meaning|phrase)", [
-            "translate", "convert", "transform", "change", "adapt"
-        ]),
-        "summarization": (r"(summarize|brief|overview|recap|digest)", [
-            "summarize", "condense", "shorten", "brief", "synopsis"
-        ])
-    }
-    
-    # Check each pattern
-    matched_tasks = {}
-    for task_type, (pattern, examples) in task_patterns.items():
-        # Check for pattern matches
-        pattern_matches = len(re.findall(pattern, message, re.IGNORECASE))
-        
-        # Check for example word matches
-        example_matches = sum(1 for example in examples 
-                            if example in message.lower())
-        
-        # Combine scores with pattern matches weighted more heavily
-        if pattern_matches > 0 or example_matches > 0:
-            matched_tasks[task_type] = (pattern_matches * 2) + example_matches
-    
-    if matched_tasks:
-        # Return task type with highest score
-        return max(matched_tasks.items(), key=lambda x: x[1])[0]
-            
-    return "default"
+    if message_lower is None:
+        message_lower = message.lower()
 
-def get_meta_template(message):
-    """
-    Get template configuration using LLM analysis.
-    """
-    meta_prompt = f"""
+    # Short messages: first hit wins, no tallying
+    if len(message_lower) < _SHORT_MESSAGE:
+        if not _TASK_SYMS.isdisjoint(message_lower):
+            return _TASK_BY_INDEX[_SYM_TASK_INDEX]
+        for match in _DETECT_RE.finditer(message_lower):
+            for category, index in _KEYWORD_PAYLOADS[match.group()]:
+                if category != _ROLE_PAYLOAD:
+                    return _TASK_BY_INDEX[index]
+        return "default"
+
+    # The unified scan fills role and task tables in one pass; ties still
+    # go to declaration order
+    _, task_scores = _scan_detection_tables(message_lower)
+
+    best = 0
+    best_score = 0
+    for index, score in task_scores.items():
+        if score > best_score or (score == best_score and index < best):
+            best_score = score
+            best = index
+
+    if not best:
+        return "default"
+    return _TASK_BY_INDEX[best]
+
+# get_meta_template's analysis prompt is constant except for the quoted
+# message, so it is built once here and pre-split at the placeholder; each
+# call is then a two-piece concatenation instead of a fresh ~600-char
+# f-string interpolation
+_META_PROMPT = """
     Analyze this user query: "{message}"
-    
+
     Determine the most appropriate role and prompt template to handle this query.
     Consider these aspects:
     1. What expert role would be best suited to answer this?
     2. What prompt technique would be most effective?
     3. What task-specific parameters would work best?
-    
+
     Return your analysis in JSON format:
-    {{
+    {
         "role": "[appropriate expert role]",
         "technique": "[suggested prompt technique]",
         "task_type": "[specific task category]",
-        "template": "[prompt template with {{query}} placeholder]",
-        "parameters": {{
+        "template": "[prompt template with {query} placeholder]",
+        "parameters": {
             "temperature": [appropriate value],
             "num_ctx": [appropriate value],
             "num_predict": [appropriate value]
-        }}
-    }}
+        }
+    }
     """
-    
+
+_META_PROMPT_HEAD, _META_PROMPT_TAIL = _META_PROMPT.split("{message}")
+
+def get_meta_template(message):
+    """
+    Get template configuration using LLM analysis.
+    """
+    meta_prompt = _META_PROMPT_HEAD + message + _META_PROMPT_TAIL
+
     # Get LLM analysis
     response = call_llm_for_analysis(meta_prompt)
     llm_result = parse_json_response(response)
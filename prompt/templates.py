@@ -5,7 +5,11 @@ Contains all templates used in prompt engineering, including role templates,
 technique templates, and specialized templates for L1 and L2 techniques.
 """
 
-from typing import Dict, Optional
+import string
+import sys
+from functools import partial
+from types import MappingProxyType
+from typing import Callable, Dict, Optional
 
 # Dictionary mapping roles to templates
 ROLE_TEMPLATES = {
@@ -77,36 +81,39 @@ TECHNIQUE_TEMPLATES = {
     "guided_conversation": "Let's discuss this step by step. I'll guide you through analyzing: {query}\n\nFirst, let's clarify the scope and objectives. Then we'll explore key considerations, and finally develop a detailed response."
 }
 
-# Level-1 technique templates
+# Level-1 technique templates.
+# Each template keeps its invariant instructions up front and appends the
+# variable content ({query}) at the end: providers cache prompts by token
+# prefix, so a stable instructional prefix can skip re-prefill across calls.
 L1_TECHNIQUE_TEMPLATES = {
     "meta_prompt": """
-    Create an effective prompt that will elicit comprehensive and structured requirements for this task:
-
-    {query}
+    Create an effective prompt that will elicit comprehensive and structured requirements for the task below.
 
     Your prompt should:
     1. Ask clarifying questions about scope and constraints
     2. Guide the analysis through different requirement categories
     3. Help identify both explicit and implicit requirements
     4. Ensure requirements are testable and measurable
-    """,
-    
-    "stakeholder_perspective": """
-    Analyze the following requirement task from three different stakeholder perspectives:
 
+    ### TASK
     {query}
+    """,
+
+    "stakeholder_perspective": """
+    Analyze the requirement task below from three different stakeholder perspectives.
 
     For each perspective (End User, Business Owner, Technical Team):
     1. What are the key priorities and concerns?
     2. What specific requirements would they emphasize?
     3. What potential conflicts might arise between perspectives?
     4. How can these requirements be reconciled into a comprehensive specification?
-    """,
-    
-    "quality_criteria": """
-    Develop detailed requirements for the following task by systematically addressing quality attributes:
 
+    ### TASK
     {query}
+    """,
+
+    "quality_criteria": """
+    Develop detailed requirements for the task below by systematically addressing quality attributes.
 
     For each of these quality attributes:
     - Functionality: What should the system do?
@@ -117,58 +124,64 @@ L1_TECHNIQUE_TEMPLATES = {
     - Maintainability: How can it be designed for future change?
 
     Format each requirement to be specific, measurable, achievable, relevant, and time-bound (SMART).
+
+    ### TASK
+    {query}
     """
 }
 
-# Level-2 technique templates (each technique has multiple step templates)
+# Level-2 technique templates (each technique has multiple step templates).
+# Same prefix-caching layout as the L1 templates: instructions first, then the
+# dynamic ### TASK / ### PRIOR section last.
 L2_TECHNIQUE_TEMPLATES = {
     "refinement_chain": [
         # First step: Initial requirements gathering
         """
-        Generate an initial set of requirements based on this task:
-        
-        {query}
-        
+        Generate an initial set of requirements based on the task below.
+
         Focus on capturing the core functionality and main user needs.
         List at least 5 high-level requirements.
+
+        ### TASK
+        {query}
         """,
-        
+
         # Second step: Analysis and elaboration
         """
-        Analyze the following initial requirements:
-        
-        {previous_response}
-        
+        Analyze the initial requirements below.
+
         For each requirement:
         1. Identify any ambiguities or missing details
         2. Add acceptance criteria
         3. Consider edge cases and exceptions
         4. Categorize as functional or non-functional
+
+        ### PRIOR
+        {previous_response}
         """,
-        
+
         # Third step: Quality check and refinement
         """
-        Review and refine these analyzed requirements:
-        
-        {previous_response}
-        
+        Review and refine the analyzed requirements below.
+
         For each requirement:
         1. Ensure it's specific, measurable, achievable, relevant, and time-bound (SMART)
         2. Remove any redundancies or conflicts
         3. Add priority levels (High/Medium/Low)
         4. Provide a rationale for each requirement
-        
+
         Present the final requirements in a structured format suitable for technical documentation.
+
+        ### PRIOR
+        {previous_response}
         """
     ],
-    
+
     "divergent_convergent": [
         # First step: Divergent thinking
         """
-        For the following task, generate as many potential requirements as possible through divergent thinking:
-        
-        {query}
-        
+        For the task below, generate as many potential requirements as possible through divergent thinking.
+
         Consider:
         - Different user types and their needs
         - Various use cases and scenarios
@@ -176,82 +189,199 @@ L2_TECHNIQUE_TEMPLATES = {
         - Non-functional requirements
         - Business rules and constraints
         - Technical considerations
-        
+
         Don't filter or evaluate at this stage - aim for quantity and diversity.
+
+        ### TASK
+        {query}
         """,
-        
+
         # Second step: Evaluation
         """
-        Review the following list of potential requirements:
-        
-        {previous_response}
-        
+        Review the list of potential requirements below.
+
         Evaluate each requirement based on:
         1. Value to users and business
         2. Technical feasibility
         3. Alignment with project scope
         4. Potential implementation complexity
-        
+
         For each requirement, provide a score of 1-5 in each category and brief justification.
+
+        ### PRIOR
+        {previous_response}
         """,
-        
+
         # Third step: Convergent thinking
         """
-        Based on your evaluation:
-        
-        {previous_response}
-        
+        Based on your evaluation below:
+
         1. Select the top 10-15 most valuable and feasible requirements
         2. Organize them into a coherent specification
         3. Identify dependencies between requirements
         4. Suggest an implementation priority order
-        
+
         Present the final requirement specification in a clear, structured format.
+
+        ### PRIOR
+        {previous_response}
         """
     ],
-    
+
     "adverse_analysis": [
         # First step: Generate baseline requirements
         """
-        Create a baseline set of requirements for:
-        
-        {query}
-        
+        Create a baseline set of requirements for the task below.
+
         Focus on the happy path scenarios and core functionality.
+
+        ### TASK
+        {query}
         """,
-        
+
         # Second step: Adversarial analysis
         """
-        Analyze these baseline requirements from an adversarial perspective:
-        
-        {previous_response}
-        
+        Analyze the baseline requirements below from an adversarial perspective.
+
         For each requirement:
         1. How could it fail or be misinterpreted?
         2. What edge cases are not covered?
         3. How might users misuse or abuse this feature?
         4. What security vulnerabilities might exist?
         5. What performance issues could arise?
-        
+
         Identify at least 3 issues for each requirement.
+
+        ### PRIOR
+        {previous_response}
         """,
-        
+
         # Third step: Refinement and hardening
         """
-        Based on the adversarial analysis:
-        
-        {previous_response}
-        
+        Based on the adversarial analysis below:
+
         1. Refine each original requirement to address the identified issues
         2. Add new requirements to cover gaps and edge cases
         3. Include explicit error handling and validation requirements
         4. Specify security and performance safeguards
-        
+
         Present the improved, hardened requirements specification.
+
+        ### PRIOR
+        {previous_response}
         """
     ]
 }
 
+# Freeze the lookup tables. Interned keys hit the pointer-equality fast path
+# in dict lookup, and the read-only views guard against accidental mutation.
+# L2 step lists become tuples: indexed just as fast and safely shareable.
+ROLE_TEMPLATES = MappingProxyType({sys.intern(k): v for k, v in ROLE_TEMPLATES.items()})
+TECHNIQUE_TEMPLATES = MappingProxyType({sys.intern(k): v for k, v in TECHNIQUE_TEMPLATES.items()})
+L1_TECHNIQUE_TEMPLATES = MappingProxyType({sys.intern(k): v for k, v in L1_TECHNIQUE_TEMPLATES.items()})
+L2_TECHNIQUE_TEMPLATES = MappingProxyType({sys.intern(k): tuple(v) for k, v in L2_TECHNIQUE_TEMPLATES.items()})
+
+# Role templates contain exactly one {query} placeholder, so each one is
+# pre-split at import time and rendered by plain concatenation — much cheaper
+# than str.format, which re-parses the template on every call.
+_ROLE_TEMPLATE_PARTS = {
+    role: tuple(template.split("{query}"))
+    for role, template in ROLE_TEMPLATES.items()
+    if template.count("{query}") == 1
+}
+
+def format_role(role: str, query: str) -> str:
+    """
+    Render a role template with the given query using the pre-split fast path.
+
+    Args:
+        role: Role name
+        query: Query text to insert
+
+    Returns:
+        Formatted prompt for the role
+    """
+    parts = get_role_parts(role)
+    return parts[0] + query + parts[1]
+
+def get_role_parts(role: str) -> tuple:
+    """
+    Get the pre-split (head, tail) pieces around {query} for a role
+    template, falling back to Assistant like format_role.
+    """
+    # Interning the incoming name lets the dict probe short-circuit on
+    # pointer identity against the interned table keys; non-str names
+    # (e.g. a null role from LLM output) fall through to the default
+    parts = _ROLE_TEMPLATE_PARTS.get(sys.intern(role) if isinstance(role, str) else role)
+    if parts is None:
+        parts = _ROLE_TEMPLATE_PARTS["Assistant"]
+    return parts
+
+# Precompiled renderers: str.format re-parses the template mini-language on
+# every call, so each technique template is split once at import into
+# (literal, field) segments and rendered by a plain join. The renderers are
+# partials over the shared segment walker, mirroring the compiled plans that
+# techniques.py builds for the L1/L2 templates.
+
+def _compile_template(template: str) -> tuple:
+    """Split a template into (literal, field) segments via string.Formatter."""
+    return tuple(
+        (literal, field)
+        for literal, field, _, _ in string.Formatter().parse(template)
+    )
+
+def _render(compiled: tuple, values: dict) -> str:
+    """Render compiled segments against a values dict (KeyError on missing
+    fields, matching str.format)."""
+    parts = []
+    for literal, field in compiled:
+        if literal:
+            parts.append(literal)
+        if field is not None:
+            parts.append(str(values[field]))
+    return "".join(parts)
+
+_TECHNIQUE_COMPILED = {
+    name: _compile_template(template)
+    for name, template in TECHNIQUE_TEMPLATES.items()
+}
+
+_TECHNIQUE_RENDERERS = {
+    name: partial(_render, compiled)
+    for name, compiled in _TECHNIQUE_COMPILED.items()
+}
+
+def get_role_renderer(role: str) -> Callable[[str], str]:
+    """
+    Get a precompiled renderer for a role template.
+
+    Args:
+        role: Role name
+
+    Returns:
+        Callable taking the query and returning the formatted prompt
+    """
+    return partial(format_role, role)
+
+def get_technique_renderer(technique_name: str) -> Optional[Callable[[dict], str]]:
+    """
+    Get a precompiled renderer for a basic technique template.
+
+    Args:
+        technique_name: Name of the technique
+
+    Returns:
+        Callable taking a values dict, or None for unknown techniques
+    """
+    return _TECHNIQUE_RENDERERS.get(technique_name)
+
+def get_technique_plan(technique_name: str) -> Optional[tuple]:
+    """
+    Get the compiled (literal, field) segments for a basic technique
+    template, or None for unknown techniques.
+    """
+    return _TECHNIQUE_COMPILED.get(technique_name)
+
 # Template access functions
 
 def get_role_template(role: str) -> str:
@@ -264,6 +394,8 @@ def get_role_template(role: str) -> str:
     Returns:
         Template string for the role
     """
+    if isinstance(role, str):
+        role = sys.intern(role)
     return ROLE_TEMPLATES.get(role, ROLE_TEMPLATES["Assistant"])
 
 def get_technique_template(technique_name: str) -> str:
@@ -278,7 +410,9 @@ def get_technique_template(technique_name: str) -> str:
     """
     if not technique_name:
         return "{query}"  # Return default template for None
-        
+
+    if isinstance(technique_name, str):
+        technique_name = sys.intern(technique_name)
     if technique_name in TECHNIQUE_TEMPLATES:
         return TECHNIQUE_TEMPLATES[technique_name]
     else:
@@ -296,6 +430,8 @@ def get_l1_technique_template(technique_name: str) -> str:
     Returns:
         Template string for the technique
     """
+    if isinstance(technique_name, str):
+        technique_name = sys.intern(technique_name)
     if technique_name in L1_TECHNIQUE_TEMPLATES:
         return L1_TECHNIQUE_TEMPLATES[technique_name]
     else:
@@ -313,6 +449,8 @@ def get_l2_technique_step_template(technique_name: str, step: int) -> Optional[s
     Returns:
         Template string for the step or None if not found
     """
+    if isinstance(technique_name, str):
+        technique_name = sys.intern(technique_name)
     if technique_name not in L2_TECHNIQUE_TEMPLATES:
         print(f"Warning: Unknown L2 technique: {technique_name}")
         return None
@@ -335,6 +473,8 @@ def get_l2_technique_steps_count(technique_name: str) -> int:
     Returns:
         Number of steps in the technique
     """
+    if isinstance(technique_name, str):
+        technique_name = sys.intern(technique_name)
     if technique_name not in L2_TECHNIQUE_TEMPLATES:
         return 0
     
@@ -1,8 +1,13 @@
 # requirements_framework_extension.py
+import re
+
 from research.framework import PromptResearchFramework
 from research.test_cases import TestCase
 from typing import Dict, Any, List, Optional
 
+# Compiled once; matches a numbered or bulleted requirement line
+_REQ_LINE_RE = re.compile(r'^\s*(\d+\.|\*|\-)\s+', re.MULTILINE)
+
 class RequirementsAnalysisFramework(PromptResearchFramework):
     """Extension of the research framework specifically for requirements analysis"""
     
@@ -32,9 +37,9 @@ class RequirementsAnalysisFramework(PromptResearchFramework):
         if result and "final_prompt" in result:
             final_text = result["final_prompt"]
             
-            # Count number of explicit requirements (identified by numbers or bullets)
-            import re
-            req_count = len(re.findall(r'^\s*(\d+\.|\*|\-)\s+', final_text, re.MULTILINE))
+            # Count number of explicit requirements (identified by numbers
+            # or bullets); finditer counts without building a match list
+            req_count = sum(1 for _ in _REQ_LINE_RE.finditer(final_text))
             result["requirements_count"] = req_count
             
             # Calculate basic metrics
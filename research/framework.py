@@ -76,8 +76,10 @@ class PromptResearchFramework:
             # Override technique for experiment
             template_config["technique"] = technique
             
-            # Update parameters
-            template_config["parameters"].update(parameters)
+            # Update parameters (the preset from determine_template is a
+            # read-only mappingproxy, so build a fresh dict instead of
+            # mutating it in place)
+            template_config["parameters"] = {**template_config["parameters"], **parameters}
             
             # Run refinement with this configuration
             result = iterative_prompt_refinement(
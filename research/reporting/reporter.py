@@ -11,6 +11,16 @@ from pathlib import Path
 
 from research.visualization import ResearchVisualizer
 
+# Serialize result payloads with orjson when available — it emits bytes
+# directly and is several times faster than stdlib json on large reports.
+try:
+    import orjson
+    def _json_dumps_bytes(obj):
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_dumps_bytes(obj):
+        return json.dumps(obj, indent=2, default=str).encode('utf-8')
+
 @dataclass
 class ResearchReport:
     """Container for research report data"""
@@ -104,9 +114,8 @@ class ResearchReporter:
                     "analysis": report.analysis
                 }
                 
-                # Try to serialize to string first to verify JSON is valid
-                json_str = json.dumps(output, indent=2, default=str)
-                json_bytes = json_str.encode('utf-8')
+                # Try to serialize first to verify JSON is valid
+                json_bytes = _json_dumps_bytes(output)
                 
                 # Write to file
                 with open(results_file, 'wb') as f:
@@ -133,11 +142,11 @@ class ResearchReporter:
             analysis_file = experiment_dir / "analysis_summary.json"
             print(f"Saving analysis summary to: {analysis_file}")
             
-            analysis_json = json.dumps(report.analysis, indent=2, default=str)
-            with open(analysis_file, 'w', encoding='utf-8') as f:
-                f.write(analysis_json)
-            
-            print(f"Analysis summary saved: {analysis_file} ({len(analysis_json)} bytes)")
+            analysis_bytes = _json_dumps_bytes(report.analysis)
+            with open(analysis_file, 'wb') as f:
+                f.write(analysis_bytes)
+
+            print(f"Analysis summary saved: {analysis_file} ({len(analysis_bytes)} bytes)")
             
             # Verify all files were created
             expected_files = [report_file, results_file, analysis_file]
@@ -632,11 +632,13 @@ def generate_latex_report(experiment_dir, results, analysis):
 def compile_latex(tex_file_path):
     """Compile LaTeX file to PDF using pdflatex"""
     try:
-        # Run pdflatex twice to resolve references
-        subprocess.run(['pdflatex', '-interaction=nonstopmode', tex_file_path], 
-                      cwd=tex_file_path.parent, check=True)
-        subprocess.run(['pdflatex', '-interaction=nonstopmode', tex_file_path], 
-                      cwd=tex_file_path.parent, check=True)
+        # Run pdflatex twice to resolve references. Capture the (very chatty)
+        # compiler output instead of streaming it to stdout; it is only shown
+        # when compilation fails.
+        for _ in range(2):
+            result = subprocess.run(['pdflatex', '-interaction=nonstopmode', tex_file_path],
+                                    cwd=tex_file_path.parent, check=True,
+                                    capture_output=True, text=True)
         
         # Check if PDF was created
         pdf_path = tex_file_path.with_suffix('.pdf')
@@ -648,6 +650,8 @@ def compile_latex(tex_file_path):
             return False
     except subprocess.CalledProcessError as e:
         print(f"Error during LaTeX compilation: {e}")
+        if e.stdout:
+            print(e.stdout[-2000:])
         return False
     except FileNotFoundError:
         print("Error: pdflatex not found. Please install LaTeX (e.g., TeX Live, MiKTeX).")